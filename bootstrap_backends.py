@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+KERNEL BACKENDS
+Pluggable implementations of UniverseBootstrap's hot kernels
+
+A backend supplies the three kernels of a buffer-arena step:
+    pre_bootstrap_update(field, noise)   field * 0.95 + noise * 0.2
+    post_bootstrap_update(field, noise)  field + 0.1 * lap - 0.05 * field**3 + noise
+    filter_noise(white, sigma, out)      periodic Gaussian filter (gaussian_filter, mode='wrap')
+                                         of a field or of each field of a stack
+Each update returns the array holding the new field, which may be a different
+buffer from the one passed in (the backend owns any spare buffers it swaps).
+After a post-bootstrap update, increment_norm(field) is ||new - old|| of that
+update, computed from the buffers the update left behind.
+
+'numpy' is the reference (bootstrap_kernels.py and scipy.ndimage). 'numba'
+compiles each update into one parallel pass over the grid and the filter
+into two parallel separable passes, with the same float operations in the same
+order, so it matches the reference bit for bit. If Numba is not installed,
+asking for it falls back to 'numpy' with a warning.
+
+python bootstrap_backends.py checks every available backend against the
+reference.
+"""
+
+import sys
+import warnings
+
+import numpy as np
+from scipy.ndimage import gaussian_filter
+
+from bootstrap_kernels import pre_bootstrap_update, post_bootstrap_update, TiledPostBootstrap
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+TILED_MIN_SIZE = 512  # Grids from this size up use the tiled stencil in the numpy backend
+BACKENDS = {}
+
+
+def register_backend(cls):
+    """Class decorator adding a backend to BACKENDS under its name"""
+    BACKENDS[cls.name] = cls
+    return cls
+
+
+def make_backend(name, size, dtype=np.float64, threads=None):
+    """Backend instance for a size x size grid, falling back to numpy if name is unavailable"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend: {name!r}")
+    cls = BACKENDS[name]
+    if not cls.available():
+        warnings.warn(f"{name} backend unavailable ({cls.requires} is not installed); "
+                      f"using numpy", RuntimeWarning, stacklevel=2)
+        cls = BACKENDS['numpy']
+    return cls(size, dtype, threads)
+
+
+@register_backend
+class NumpyBackend:
+    """Reference kernels: in-place NumPy ufuncs and scipy.ndimage
+
+    Grids of TILED_MIN_SIZE and up use the cache-tiled stencil on `threads`
+    threads (0 disables it).
+    """
+
+    name = 'numpy'
+    requires = None
+
+    @staticmethod
+    def available():
+        return True
+
+    def __init__(self, size, dtype=np.float64, threads=None):
+        self.size = size
+        self.dtype = np.dtype(dtype)
+        self.stencil = None
+        if threads != 0 and size >= TILED_MIN_SIZE:
+            self.stencil = TiledPostBootstrap(size, self.dtype, threads)
+            self.spare = np.empty((size, size), dtype=self.dtype)
+            self.work = None  # Only increment_norm needs it, allocated on first use
+        else:
+            self.laplacian = np.empty((size, size), dtype=self.dtype)
+            self.work = np.empty((size, size), dtype=self.dtype)
+
+    def pre_bootstrap_update(self, field, noise, damping=0.95, gain=0.2):
+        return pre_bootstrap_update(field, noise, damping, gain)
+
+    def post_bootstrap_update(self, field, noise, diffusion=0.1, coupling=0.05):
+        if self.stencil is None:
+            return post_bootstrap_update(field, noise, self.laplacian, self.work,
+                                         diffusion, coupling)
+        self.stencil.diffusion, self.stencil.coupling = diffusion, coupling
+        out = self.stencil(field, noise, self.spare)
+        self.spare = field
+        return out
+
+    def increment_norm(self, field):
+        if self.stencil is None:
+            return l2_norm(self.laplacian)  # The untiled update leaves its increment here
+        if self.work is None:
+            self.work = np.empty((self.size, self.size), dtype=self.dtype)
+        return l2_norm(np.subtract(field, self.spare, out=self.work))
+
+    def filter_noise(self, white, sigma, out):
+        # Stacks: no smoothing across fields (scipy skips zero-sigma axes)
+        sigmas = [0] * (white.ndim - 2) + [sigma, sigma]
+        return gaussian_filter(white, sigma=sigmas, output=out, mode='wrap')
+
+
+def l2_norm(array):
+    """Euclidean norm of a contiguous array, as a float"""
+    return float(np.sqrt(np.vdot(array, array)))
+
+
+def gaussian_weights(sigma, truncate=4.0):
+    """Half of gaussian_filter's kernel: weights[k] for offsets k = 0..radius"""
+    radius = int(truncate * float(sigma) + 0.5)
+    x = np.arange(-radius, radius + 1)
+    phi = np.exp(-0.5 / (sigma * sigma) * x**2)
+    phi /= phi.sum()
+    return phi[radius:]
+
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _numba_pre_bootstrap(field, noise, damping, gain):
+        n, m = field.shape
+        for i in numba.prange(n):
+            for j in range(m):
+                field[i, j] = field[i, j] * damping + noise[i, j] * gain
+
+    @numba.njit(parallel=True, cache=True)
+    def _numba_post_bootstrap(field, noise, out, diffusion, coupling, four):
+        # Same operation order as bootstrap_kernels.post_bootstrap_update
+        n, m = field.shape
+        for i in numba.prange(n):
+            up = (i - 1) % n
+            down = (i + 1) % n
+            for j in range(m):
+                left = (j - 1) % m
+                right = (j + 1) % m
+                f = field[i, j]
+                laplacian = (field[up, j] + field[down, j] + field[i, left]
+                             + field[i, right] - f * four)
+                out[i, j] = f + ((laplacian * diffusion - f * f * f * coupling) + noise[i, j])
+
+    @numba.njit(parallel=True, cache=True)
+    def _numba_difference_norm(new, old):
+        n, m = new.shape
+        total = 0.0
+        for i in numba.prange(n):
+            for j in range(m):
+                d = np.float64(new[i, j]) - np.float64(old[i, j])
+                total += d * d
+        return np.sqrt(total)
+
+    @numba.njit(parallel=True, cache=True)
+    def _numba_filter_rows(source, weights, out):
+        # Along axis 0, in scipy's correlate1d order: centre, then pairs from the outside in
+        n, m = source.shape
+        radius = len(weights) - 1
+        for i in numba.prange(n):
+            acc = np.empty(m)
+            for j in range(m):
+                acc[j] = source[i, j] * weights[0]
+            for k in range(radius, 0, -1):
+                above = source[(i - k) % n]
+                below = source[(i + k) % n]
+                w = weights[k]
+                for j in range(m):
+                    # Pairs are summed in double, as in scipy's line buffers
+                    acc[j] += (np.float64(above[j]) + np.float64(below[j])) * w
+            for j in range(m):
+                out[i, j] = acc[j]
+
+    @numba.njit(parallel=True, cache=True)
+    def _numba_filter_columns(source, weights, out):
+        # Along axis 1, on a periodically extended copy of each row
+        n, m = source.shape
+        radius = len(weights) - 1
+        for i in numba.prange(n):
+            line = np.empty(m + 2 * radius)
+            for t in range(m + 2 * radius):
+                line[t] = source[i, (t - radius) % m]
+            for j in range(m):
+                acc = line[j + radius] * weights[0]
+                for k in range(radius, 0, -1):
+                    acc += (line[j + radius - k] + line[j + radius + k]) * weights[k]
+                out[i, j] = acc
+
+
+@register_backend
+class NumbaBackend:
+    """JIT-compiled kernels: each update fused into one parallel pass
+
+    Constants are passed in the field dtype so float32 arithmetic stays in
+    float32, as NumPy does with Python scalars. threads sets Numba's thread
+    count (process-wide).
+    """
+
+    name = 'numba'
+    requires = 'numba'
+
+    @staticmethod
+    def available():
+        return numba is not None
+
+    def __init__(self, size, dtype=np.float64, threads=None):
+        self.size = size
+        self.dtype = np.dtype(dtype)
+        self.spare = np.empty((size, size), dtype=self.dtype)
+        self.filter_work = np.empty((size, size), dtype=self.dtype)
+        if threads:
+            numba.set_num_threads(min(threads, numba.config.NUMBA_NUM_THREADS))
+
+    def pre_bootstrap_update(self, field, noise, damping=0.95, gain=0.2):
+        scalar = self.dtype.type
+        _numba_pre_bootstrap(field, noise, scalar(damping), scalar(gain))
+        return field
+
+    def post_bootstrap_update(self, field, noise, diffusion=0.1, coupling=0.05):
+        scalar = self.dtype.type
+        out = self.spare
+        _numba_post_bootstrap(field, noise, out, scalar(diffusion), scalar(coupling), scalar(4))
+        self.spare = field
+        return out
+
+    def increment_norm(self, field):
+        return float(_numba_difference_norm(field, self.spare))  # spare holds the old field
+
+    def filter_noise(self, white, sigma, out):
+        weights = gaussian_weights(sigma)
+        shape = (-1, self.size, self.size)
+        for plane, filtered in zip(white.reshape(shape), out.reshape(shape)):
+            _numba_filter_rows(plane, weights, self.filter_work)
+            _numba_filter_columns(self.filter_work, weights, filtered)
+        return out
+
+
+def check_backends(sizes=(7, 64, 600), sigmas=(0.05, 1.3, 4.0, 18.5), seed=0):
+    """Compare every available backend with the numpy reference; returns True if all match
+
+    Prints the largest absolute difference of each kernel per backend, size
+    and dtype (0 means bit-identical).
+    """
+    rng = np.random.default_rng(seed)
+    passed = True
+    for name, cls in BACKENDS.items():
+        if name == 'numpy':
+            continue
+        if not cls.available():
+            print(f"{name:8s} skipped ({cls.requires} is not installed)")
+            continue
+        for size in sizes:
+            for dtype in (np.float64, np.float32):
+                reference = NumpyBackend(size, dtype, threads=0)
+                backend = cls(size, dtype)
+                field = rng.standard_normal((size, size), dtype=dtype)
+                noise = rng.standard_normal((size, size), dtype=dtype) * dtype(0.05)
+
+                expected = reference.pre_bootstrap_update(field.copy(), noise.copy())
+                actual = backend.pre_bootstrap_update(field.copy(), noise.copy())
+                errors = {'pre': np.abs(actual - expected).max()}
+
+                expected = reference.post_bootstrap_update(field.copy(), noise)
+                actual = backend.post_bootstrap_update(field.copy(), noise)
+                errors['post'] = np.abs(actual - expected).max()
+
+                errors['filter'] = max(
+                    np.abs(backend.filter_noise(field, sigma, np.empty_like(field)) -
+                           reference.filter_noise(field, sigma, np.empty_like(field))).max()
+                    for sigma in sigmas)
+
+                ok = all(error == 0 for error in errors.values())
+                passed &= ok
+                print(f"{name:8s} {size:4d}x{size:<4d} {np.dtype(dtype).name:8s} " +
+                      "  ".join(f"{kernel}={error:.1e}" for kernel, error in errors.items()) +
+                      ("" if ok else "  MISMATCH"))
+    return passed
+
+
+if __name__ == '__main__':
+    print("="*70)
+    print(f"BACKEND CONFORMANCE - {', '.join(BACKENDS)} against numpy")
+    print("="*70)
+    ok = check_backends()
+    print("="*70)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+EVENT-TRIGGERED CAPTURE
+Dense frames around events, sparse frames everywhere else
+
+A CaptureScheduler decides which steps of a run become frames. Outside
+events it captures sparsely (every sparse_every steps). Every `every` steps
+it also keeps a snapshot of the field in a ring of the last `ring`
+snapshots, so the recent past is still available when something happens.
+When an event fires, the ring's snapshots (up to ring * every steps back) are
+flushed as frames, and frames are captured live every `every` steps for the
+next `after` steps. The transition gets dense detail on both sides without
+densely capturing the whole run. The bootstrap step itself is left to the
+caller (run_simulation saves it as frame_bootstrap.png).
+
+Events:
+    'bootstrap'   the bootstrap step
+    'xi-jump'     the measured ξ rose by more than a fraction XI_JUMP of itself
+                  (and by more than XI_JUMP_FLOOR * ξ_c) over XI_JUMP_SPAN
+                  observations, on XI_JUMP_PERSIST observations in a row
+                  (needs the universe's observables)
+    'variance'    the measured variance exceeded VARIANCE_SPIKE times its
+                  running mean (needs the universe's observables)
+The relative, persistent ξ test ignores the observation-to-observation noise
+of the measured ξ once domains are tens of cells wide. An event of a new
+kind inside an open window extends the window, up to WINDOW_STRETCH * after
+steps past the event that opened it; repeats of a kind already in the window
+are ignored. After MAX_EVENTS windows, later events are ignored.
+
+Ring snapshots are quantized to 16 bits (offset and scale per snapshot) in
+one preallocated array, a quarter of a float64 copy. Set quantize=False to
+keep exact copies in the field dtype.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from bootstrap_observables import OBSERVATION_DTYPE
+
+CAPTURE_EVERY = 5  # Steps between ring snapshots, and between frames in an event window
+CAPTURE_RING = 16  # Ring snapshots: an event's frames reach CAPTURE_RING * CAPTURE_EVERY steps back
+CAPTURE_AFTER = 60  # Steps of live frames after an event
+CAPTURE_SPARSE_EVERY = 200  # Steps between frames outside event windows
+XI_JUMP = 0.5  # Relative rise of the measured ξ over XI_JUMP_SPAN observations that is an event
+XI_JUMP_SPAN = 3  # Observations the rise is measured over
+XI_JUMP_FLOOR = 0.2  # The rise must also exceed this fraction of ξ_c (sub-cell flicker is not an event)
+XI_JUMP_PERSIST = 2  # Consecutive observations the rise must hold for
+VARIANCE_SPIKE = 2.0  # Variance above this multiple of its running mean is an event
+VARIANCE_MEMORY = 0.1  # Weight of each new observation in the running mean variance
+MAX_EVENTS = 8  # Event windows per run
+WINDOW_STRETCH = 3  # Events extend a window to at most this many `after` spans past its opening event
+LEVELS = 2**16 - 1  # Quantization levels of a ring snapshot
+STATE = ('time', 'temperature', 'correlation_length', 'bootstrapped', 'xi_critical')
+
+
+class CapturedFrame:
+    """The state save_frame draws, as of one step (a ring snapshot or a live universe)"""
+
+    def __init__(self, size, field, state):
+        self.size = size
+        self.field = field
+        for name in STATE:
+            setattr(self, name, state[name])
+
+
+class FieldRing:
+    """The last `capacity` field snapshots with their step and frame state, in preallocated arrays"""
+
+    def __init__(self, size, capacity=CAPTURE_RING, dtype=np.float64, quantize=True):
+        self.size = size
+        self.quantize = quantize
+        self.fields = np.empty((capacity, size, size), dtype=np.uint16 if quantize else dtype)
+        self.scratch = np.empty((size, size), dtype=np.float64) if quantize else None
+        self.entries = [None] * capacity  # (step, offset, scale, state) per slot
+        self.next = 0
+
+    def push(self, universe, step):
+        """Store the universe's field and state as of `step`, overwriting the oldest snapshot"""
+        slot = self.next
+        field = universe.field
+        offset, scale = 0.0, 1.0
+        if self.quantize:
+            offset = float(field.min())
+            scale = (float(field.max()) - offset) / LEVELS or 1.0
+            np.subtract(field, offset, out=self.scratch)
+            self.scratch *= 1.0 / scale
+            np.rint(self.scratch, out=self.scratch)
+            self.fields[slot] = self.scratch
+        else:
+            self.fields[slot] = field
+        state = {name: getattr(universe, name) for name in STATE}
+        state['bootstrapped'] = bool(state['bootstrapped'])
+        self.entries[slot] = (step, offset, scale, state)
+        self.next = (slot + 1) % len(self.entries)
+
+    def frames(self, first, last):
+        """(step, CapturedFrame) of the stored snapshots with first <= step <= last, oldest first"""
+        order = [(self.next + k) % len(self.entries) for k in range(len(self.entries))]
+        frames = []
+        for slot in order:
+            if self.entries[slot] is None or not first <= self.entries[slot][0] <= last:
+                continue
+            step, offset, scale, state = self.entries[slot]
+            field = self.fields[slot]
+            if self.quantize:
+                field = (field * scale + offset).astype(np.float32)
+            frames.append((step, CapturedFrame(self.size, field.copy(), state)))
+        return frames
+
+
+class CaptureScheduler:
+    """Which steps of a run become frames: sparse, plus dense windows around events
+
+    Call update(universe, step, bootstrapped) at every step that is a
+    multiple of `every` or of `sparse_every`, and at the bootstrap step. It
+    returns the frames to save now as (step, label, frame), oldest first.
+    frame is the universe itself for live frames (so snapshot it before
+    stepping on) or a CapturedFrame from the ring. No live frame is returned
+    at the bootstrap step, which the caller saves itself. stops(step) lists
+    the next steps update() must see.
+    """
+
+    def __init__(self, size, dtype=np.float64, every=CAPTURE_EVERY, ring=CAPTURE_RING,
+                 after=CAPTURE_AFTER, sparse_every=CAPTURE_SPARSE_EVERY, quantize=True):
+        self.every = every
+        self.after = after
+        self.sparse_every = sparse_every
+        self.ring = FieldRing(size, ring, dtype, quantize) if ring else None
+        self.window_start = None  # (kind, step) of the event that opened the last window
+        self.window_end = None  # Last step of the open event window
+        self.window_kinds = []  # Kinds of the events in the open window
+        self.last_saved = -1
+        self.events = []  # (kind, step) of every event that opened or extended a window
+        self.windows = 0
+        self.observations_seen = 0
+        self.mean_variance = None
+        self.xi_rising = 0  # Consecutive observations with a xi-jump sized rise
+
+    def stops(self, step):
+        """The next steps (from step on) update() must see"""
+        return [step + -step % self.every, step + -step % self.sparse_every]
+
+    def detect(self, universe, bootstrapped):
+        """Kinds of the events that fired since the last call"""
+        events = ['bootstrap'] if bootstrapped else []
+        observables = universe.observables
+        if observables is None:
+            return events
+        series = observables.series
+        xi_column = OBSERVATION_DTYPE.names.index('xi_measured')
+        for index in range(self.observations_seen, len(series)):
+            record = dict(zip(OBSERVATION_DTYPE.names, series[index]))
+            variance = record['variance']
+            if record['time'] == 0:
+                continue  # The initial condition, not yet the dynamics
+            if index > XI_JUMP_SPAN:
+                xi, before = record['xi_measured'], series[index - XI_JUMP_SPAN][xi_column]
+                rising = xi > (1 + XI_JUMP) * before and xi - before > XI_JUMP_FLOOR * universe.xi_critical
+                self.xi_rising = self.xi_rising + 1 if rising else 0
+                if self.xi_rising == XI_JUMP_PERSIST:
+                    events.append('xi-jump')
+            if self.mean_variance is None:
+                self.mean_variance = variance
+            elif variance > VARIANCE_SPIKE * self.mean_variance:
+                events.append('variance')
+            self.mean_variance += VARIANCE_MEMORY * (variance - self.mean_variance)
+        self.observations_seen = len(series)
+        return list(dict.fromkeys(events))
+
+    def update(self, universe, step, bootstrapped=False):
+        """Frames to save at `step`, after the universe has reached it"""
+        saved = []
+        for kind in self.detect(universe, bootstrapped):
+            if self.window_end is not None and step <= self.window_end:
+                if kind not in self.window_kinds:
+                    limit = self.window_start[1] + WINDOW_STRETCH * self.after
+                    self.window_end = max(self.window_end, min(step + self.after, limit))
+                    self.window_kinds.append(kind)
+                    self.events.append((kind, step))
+            elif self.windows < MAX_EVENTS:
+                self.window_start = (kind, step)
+                self.window_end = step + self.after
+                self.window_kinds = [kind]
+                self.events.append((kind, step))
+                self.windows += 1
+                if self.ring is not None:
+                    saved += [(past, f'{kind} {past - step:+d}', frame)
+                              for past, frame in self.ring.frames(self.last_saved + 1, step - 1)]
+        if self.ring is not None and step % self.every == 0:
+            self.ring.push(universe, step)
+        in_window = self.window_end is not None and step <= self.window_end
+        if step > self.last_saved and not bootstrapped:
+            if step % self.sparse_every == 0:
+                saved.append((step, step, universe))
+            elif in_window and step % self.every == 0:
+                kind, start = self.window_start
+                saved.append((step, f'{kind} {step - start:+d}', universe))
+        if saved:
+            self.last_saved = saved[-1][0]
+        if bootstrapped:
+            self.last_saved = step  # The caller's bootstrap frame
+        return saved
+
+    def save(self, path):
+        """Write the ring and scheduling state to path (.npz), atomically"""
+        state = {
+            'window_start': self.window_start,
+            'window_end': self.window_end,
+            'window_kinds': self.window_kinds,
+            'last_saved': self.last_saved,
+            'events': self.events,
+            'windows': self.windows,
+            'observations_seen': self.observations_seen,
+            'mean_variance': self.mean_variance,
+            'xi_rising': self.xi_rising,
+            'ring_entries': self.ring.entries if self.ring is not None else None,
+            'ring_next': self.ring.next if self.ring is not None else 0,
+        }
+        partial = f'{path}.partial'
+        with open(partial, 'wb') as f:
+            fields = self.ring.fields if self.ring is not None else np.empty(0)
+            np.savez(f, fields=fields, state=np.array(json.dumps(state)))
+        os.replace(partial, path)
+
+    def restore(self, path):
+        """Continue from the state written by save() (same constructor arguments)"""
+        with np.load(path) as data:
+            state = json.loads(str(data['state']))
+            if self.ring is not None:
+                self.ring.fields[...] = data['fields']
+                self.ring.entries = [tuple(entry) if entry is not None else None
+                                     for entry in state['ring_entries']]
+                self.ring.next = state['ring_next']
+        self.window_start = tuple(state['window_start']) if state['window_start'] else None
+        self.window_end = state['window_end']
+        self.window_kinds = state['window_kinds']
+        self.last_saved = state['last_saved']
+        self.events = [tuple(event) for event in state['events']]
+        self.windows = state['windows']
+        self.observations_seen = state['observations_seen']
+        self.mean_variance = state['mean_variance']
+        self.xi_rising = state['xi_rising']
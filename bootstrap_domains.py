@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+DOMAIN TRACKER
+Sign domains of the field, followed across snapshots under persistent IDs
+
+A domain is a 4-connected region where the field has one sign, on the
+periodic grid. Each snapshot is labeled with scipy.ndimage.label (positive
+and negative regions separately), then regions that touch across the
+periodic boundary are merged by union-find over the boundary rows and
+columns only. The grid is never padded or copied. Label buffers are
+preallocated and reused, and the previous snapshot's labels are kept by
+swapping buffers.
+
+Consecutive snapshots are matched by overlap. Each domain takes the
+persistent ID of the previous same-sign domain it overlaps most, unless a
+larger piece of that domain claims it (the largest fragment of a split
+keeps the ID, and a merger keeps the ID of its largest part). Domains left
+unmatched are born with a new ID. Previous domains left unclaimed die, and
+their lifetime (death time - birth time) is recorded.
+
+Per snapshot the tracker records the domain count, the size distribution
+(log2 bins) and the births and deaths. Tracking runs only on snapshot
+strides, so on a 4096^2 grid it costs a few labeling passes every
+DOMAIN_EVERY steps, not every step.
+
+python bootstrap_domains.py [trajectory] tracks the domains of a stored
+trajectory (see bootstrap_trajectory.py).
+"""
+
+import os
+import sys
+
+import numpy as np
+from scipy import ndimage
+
+DENSE_OVERLAP_CELLS = 4  # Overlap tables of up to this many entries per grid cell are counted densely
+DOMAIN_DTYPE = np.dtype([('time', np.int64), ('count', np.int64), ('positive', np.int64),
+                         ('largest', np.int64), ('mean_size', np.float64), ('born', np.int64),
+                         ('died', np.int64)])
+
+
+class DomainLabeler:
+    """Periodic sign-domain labeling of size x size fields into reused buffers"""
+
+    def __init__(self, size):
+        self.size = size
+        self.mask = np.empty((size, size), dtype=bool)
+        self.work = np.empty((size, size), dtype=np.int32)
+
+    def merge_periodic(self, labels, count, positive):
+        """Union-find over the labels facing each other across the periodic boundary
+
+        Returns the compacted label of each raw label and the compacted
+        counts (all, positive). Every class keeps its smallest raw label as root, so
+        positive domains still come first.
+        """
+        facing = np.concatenate([np.stack([labels[0], labels[-1]]),
+                                 np.stack([labels[:, 0], labels[:, -1]])], axis=1)
+        a, b = facing
+        joined = (a != b) & ((a <= positive) == (b <= positive))
+        parent = {}
+
+        def find(x):
+            while parent.get(x, x) != x:
+                parent[x] = parent.get(parent[x], parent[x])  # Path halving
+                x = parent[x]
+            return x
+
+        for x, y in set(zip(a[joined].tolist(), b[joined].tolist())):
+            x, y = find(x), find(y)
+            if x != y:
+                parent[max(x, y)] = min(x, y)
+
+        roots = np.arange(count + 1, dtype=np.int32)
+        if parent:
+            children = np.fromiter(parent, dtype=np.int32)
+            roots[children] = [find(x) for x in parent]
+        ranks = np.cumsum(roots == np.arange(count + 1), dtype=np.int32) - 1
+        return ranks[roots], int(ranks[-1]), int(ranks[positive])
+
+    def label(self, field, out):
+        """Label the sign domains of field into out (int32); returns (count, positive count)
+
+        Positive domains are labeled 1..positive, the others positive+1..count.
+        """
+        np.greater(field, 0, out=self.mask)
+        positive = ndimage.label(self.mask, output=out)
+        np.logical_not(self.mask, out=self.mask)
+        negative = ndimage.label(self.mask, output=self.work)
+        np.add(self.work, positive, out=self.work, where=self.mask)
+        out += self.work
+        raw = positive + negative
+        compact, count, positive = self.merge_periodic(out, raw, positive)
+        if count != raw:
+            np.take(compact, out, out=out, mode='clip')
+        return count, positive
+
+
+class DomainTracker:
+    """Sign domains of a run's snapshots under persistent IDs, with counts, sizes and lifetimes
+
+    update(field, time) labels one snapshot and matches it to the previous
+    one. series() has one DOMAIN_DTYPE record per snapshot, size_histograms()
+    the domain sizes per snapshot in log2 bins (bin b: sizes 2**b..2**(b+1)-1),
+    and lifetimes() the lifetimes of the domains that have died.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.labeler = DomainLabeler(size)
+        self.labels = np.zeros((size, size), dtype=np.int32)
+        self.previous = np.zeros((size, size), dtype=np.int32)
+        self.keys = np.empty((size, size), dtype=np.int64)
+        self.bins = int(np.log2(size * size)) + 1
+        # Persistent ID of each label of the previous snapshot (index 0 unused)
+        self.ids = np.zeros(1, dtype=np.int64)
+        self.count = 0
+        self.positive = 0
+        self.next_id = 1
+        # IDs born at each snapshot form a contiguous range: (first ID, birth time) per snapshot
+        self.birth_ids = []
+        self.birth_times = []
+        self.records = []
+        self.histograms = []
+        self.ended = []
+
+    def overlaps(self, count, positive):
+        """(previous label, current label, overlap in cells) of every same-sign overlap"""
+        stride = count + 1
+        np.multiply(self.previous, stride, out=self.keys)
+        self.keys += self.labels
+        entries = (self.count + 1) * stride
+        if entries <= DENSE_OVERLAP_CELLS * self.size**2:
+            cells = np.bincount(self.keys.ravel(), minlength=entries)
+            keys = np.flatnonzero(cells)
+            cells = cells[keys]
+        else:
+            keys, cells = np.unique(self.keys, return_counts=True)
+        previous, current = np.divmod(keys, stride)
+        same_sign = (previous <= self.positive) == (current <= positive)
+        return previous[same_sign], current[same_sign], cells[same_sign]
+
+    def match(self, count, positive):
+        """Persistent IDs of the current labels (0 where unmatched) and the IDs that died"""
+        previous, current, cells = self.overlaps(count, positive)
+        # Best previous domain of each current domain...
+        order = np.lexsort((-cells, current))
+        best = order[np.r_[True, current[order][1:] != current[order][:-1]]]
+        previous, current, cells = previous[best], current[best], cells[best]
+        # ...kept only by the largest of the current domains choosing it
+        order = np.lexsort((-cells, previous))
+        kept = order[np.r_[True, previous[order][1:] != previous[order][:-1]]]
+        ids = np.zeros(count + 1, dtype=np.int64)
+        ids[current[kept]] = self.ids[previous[kept]]
+        survived = np.zeros(self.count + 1, dtype=bool)
+        survived[previous[kept]] = True
+        return ids, self.ids[1:][~survived[1:]]
+
+    def birth_time(self, ids):
+        """Birth time of each persistent ID"""
+        return np.asarray(self.birth_times)[np.searchsorted(self.birth_ids, ids, side='right') - 1]
+
+    def update(self, field, time):
+        """Label the snapshot of field at `time`, match it to the previous one and record it"""
+        count, positive = self.labeler.label(field, self.labels)
+        if self.count:
+            ids, dead = self.match(count, positive)
+        else:
+            ids, dead = np.zeros(count + 1, dtype=np.int64), np.empty(0, dtype=np.int64)
+        born = np.flatnonzero(ids[1:] == 0) + 1
+        if len(born):
+            self.birth_ids.append(self.next_id)
+            self.birth_times.append(time)
+            ids[born] = np.arange(self.next_id, self.next_id + len(born))
+            self.next_id += len(born)
+        if len(dead):
+            self.ended.append(time - self.birth_time(dead))
+
+        sizes = np.bincount(self.labels.ravel(), minlength=count + 1)[1:]
+        histogram = np.bincount(np.log2(sizes).astype(np.intp), minlength=self.bins)
+        self.records.append((time, count, positive, int(sizes.max()), float(sizes.mean()),
+                             len(born), len(dead)))
+        self.histograms.append(histogram)
+        self.ids, self.count, self.positive = ids, count, positive
+        self.labels, self.previous = self.previous, self.labels
+        return self.records[-1]
+
+    def persistent_labels(self):
+        """Persistent ID of every cell of the last snapshot (a new array)"""
+        return self.ids[self.previous]
+
+    def series(self):
+        return np.array(self.records, dtype=DOMAIN_DTYPE)
+
+    def size_histograms(self):
+        return np.array(self.histograms, dtype=np.int64).reshape(-1, self.bins)
+
+    def lifetimes(self):
+        """Lifetimes of the domains that have died, in time units"""
+        return np.concatenate(self.ended) if self.ended else np.empty(0, dtype=np.int64)
+
+    def save(self, path):
+        """Write the records and the tracking state to path (.npz), atomically
+
+        load() restores a tracker that continues identically.
+        """
+        partial = f'{path}.partial'
+        with open(partial, 'wb') as f:
+            np.savez(f, series=self.series(), size_histograms=self.size_histograms(),
+                     lifetimes=self.lifetimes(), labels=self.previous, ids=self.ids,
+                     state=np.array([self.size, self.count, self.positive, self.next_id]),
+                     birth_ids=np.array(self.birth_ids, dtype=np.int64),
+                     birth_times=np.array(self.birth_times, dtype=np.int64))
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, path):
+        """Restore a tracker written by save()"""
+        with np.load(path) as data:
+            size, count, positive, next_id = data['state'].tolist()
+            tracker = cls(size)
+            tracker.previous[...] = data['labels']
+            tracker.ids = data['ids']
+            tracker.count, tracker.positive, tracker.next_id = count, positive, next_id
+            tracker.birth_ids = data['birth_ids'].tolist()
+            tracker.birth_times = data['birth_times'].tolist()
+            tracker.records = [tuple(row) for row in data['series'].tolist()]
+            tracker.histograms = list(data['size_histograms'])
+            if len(data['lifetimes']):
+                tracker.ended = [data['lifetimes']]
+        return tracker
+
+
+if __name__ == '__main__':
+    from bootstrap_trajectory import Trajectory
+    path = sys.argv[1] if len(sys.argv) > 1 else '/home/claude/trajectory'
+    trajectory = Trajectory(path)
+    tracker = DomainTracker(trajectory.size)
+    for index in range(len(trajectory)):
+        tracker.update(trajectory.snapshot(index), int(trajectory.metadata['step'][index]))
+    print("="*70)
+    print(f"SIGN DOMAINS of {path} ({len(trajectory)} snapshots)")
+    print("="*70)
+    for record in tracker.series()[::max(1, len(trajectory) // 15)]:
+        print(f"Step {record['time']:5d}: {record['count']:7d} domains ({record['positive']} positive), "
+              f"largest {record['largest']:8d} cells, {record['born']} born, {record['died']} died")
+    lifetimes = tracker.lifetimes()
+    if len(lifetimes):
+        print(f"{len(lifetimes)} domains died; lifetime median {np.median(lifetimes):.0f}, "
+              f"max {lifetimes.max()} steps")
+    print("="*70)
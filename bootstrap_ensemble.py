@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+UNIVERSE BOOTSTRAP ENSEMBLE
+Many universes stepped together as one (N, size, size) field tensor
+
+Each member follows the same rules as run_bootstrap_sim.UniverseBootstrap,
+but noise, Laplacian and cubic updates are evaluated for blocks of members
+at once (sized so the block's temporaries stay in cache). Cooling rate,
+XI_CRITICAL, damping and coupling can differ per member. Noise always comes
+from the spectral engine (bootstrap_noise.py), which fills a whole block's
+white spectra in one buffer. Each member owns a Generator spawned from the
+ensemble seed, so a member's trajectory does not depend on the block size or
+on how many other members run alongside it.
+"""
+
+import time
+
+import numpy as np
+
+from bootstrap_noise import SpectralNoise, make_rng, spawn_seeds
+from run_bootstrap_sim import (GRID_SIZE, T_INITIAL, T_FINAL, COOLING_RATE,
+                               XI_CRITICAL, NOISE_AMPLITUDE, SEED, BIT_GENERATOR)
+
+DAMPING = 0.95   # Pre-bootstrap field memory per step
+COUPLING = 0.05  # Post-bootstrap phi^3 self-interaction
+BLOCK_CELLS = 2**16  # Cells per vectorized block (keeps temporaries cache-resident)
+
+
+class UniverseEnsemble:
+    """Simulate N independent universes in one stacked array"""
+
+    def __init__(self, members, size=GRID_SIZE, cooling_rate=COOLING_RATE,
+                 xi_critical=XI_CRITICAL, damping=DAMPING, coupling=COUPLING,
+                 block=None, seed=SEED, bit_generator=BIT_GENERATOR):
+        self.members = members
+        self.size = size
+        self.block = block or max(1, BLOCK_CELLS // (size * size))
+        self.spectral_noise = SpectralNoise(size)
+
+        # Per-member parameters (scalars broadcast to every member)
+        self.cooling_rate = self._per_member(cooling_rate)
+        self.xi_critical = self._per_member(xi_critical)
+        self.damping = self._per_member(damping)
+        self.coupling = self._per_member(coupling)
+
+        self.rngs = [make_rng(child, bit_generator) for child in spawn_seeds(seed, members)]
+        self.field = np.empty((members, size, size))
+        for rng, field in zip(self.rngs, self.field):
+            rng.standard_normal(dtype=self.field.dtype, out=field)
+        self.field *= 0.1
+        self.temperature = np.full(members, T_INITIAL)
+        self.time = np.zeros(members, dtype=int)
+        self.bootstrapped = np.zeros(members, dtype=bool)
+        self.bootstrap_step = np.full(members, -1)
+        self.correlation_length = self.calculate_xi(self.temperature)
+
+    def _per_member(self, value):
+        """Broadcast a scalar or sequence parameter to one float per member"""
+        return np.broadcast_to(np.asarray(value, dtype=float), (self.members,)).copy()
+
+    def _select(self, index):
+        """Indexer for a subset of members
+
+        A plain slice when the members are consecutive, so the field is updated
+        in place through a view instead of being gathered and scattered back.
+        """
+        if index[-1] - index[0] == len(index) - 1:
+            return slice(index[0], index[-1] + 1)
+        return index
+
+    def calculate_xi(self, T):
+        """Correlation length: xi ~ 1/T"""
+        return 10.0 / (T + 0.1)
+
+    def generate_correlated_noise(self, xi, index):
+        """Generate one noise field per entry of xi, for the members in index"""
+        rngs = [self.rngs[i] for i in index]
+        return self.spectral_noise.sample_batch(xi / 3.0, rngs) * NOISE_AMPLITUDE
+
+    def update_field_pre_bootstrap(self, index):
+        """Pre-bootstrap: pure fluctuations, for the given members"""
+        members = self._select(index)
+        noise = self.generate_correlated_noise(self.correlation_length[members], index)
+        field = self.field[members]
+        field *= self.damping[members][:, None, None]
+        field += noise * 0.2
+        if not isinstance(members, slice):
+            self.field[members] = field
+
+    def update_field_post_bootstrap(self, index):
+        """Post-bootstrap: observation maintains structure, for the given members"""
+        members = self._select(index)
+        field = self.field[members]
+        field_padded = np.pad(field, ((0, 0), (1, 1), (1, 1)), mode='wrap')
+        laplacian = (
+            field_padded[:, :-2, 1:-1] + field_padded[:, 2:, 1:-1] +
+            field_padded[:, 1:-1, :-2] + field_padded[:, 1:-1, 2:] -
+            4 * field
+        )
+
+        noise = self.generate_correlated_noise(self.correlation_length[members], index) * 0.05
+        coupling = self.coupling[members][:, None, None]
+        field += 0.1 * laplacian - coupling * field**3 + noise
+        if not isinstance(members, slice):
+            self.field[members] = field
+
+    def step(self):
+        """Single simulation step for every member
+
+        Returns a boolean mask of members that bootstrapped on this step. As in
+        run_bootstrap_sim, those members skip their field update and clock tick.
+        """
+        cooling = self.temperature > T_FINAL
+        self.temperature[cooling] -= self.cooling_rate[cooling] * 0.01
+
+        self.correlation_length = self.calculate_xi(self.temperature)
+
+        triggered = ~self.bootstrapped & (self.correlation_length >= self.xi_critical)
+        self.bootstrapped |= triggered
+        self.bootstrap_step[triggered] = self.time[triggered]
+
+        pre = np.flatnonzero(~self.bootstrapped)
+        post = np.flatnonzero(self.bootstrapped & ~triggered)
+        for start in range(0, len(pre), self.block):
+            self.update_field_pre_bootstrap(pre[start:start + self.block])
+        for start in range(0, len(post), self.block):
+            self.update_field_post_bootstrap(post[start:start + self.block])
+
+        self.time[~triggered] += 1
+        return triggered
+
+    def get_state(self, member):
+        """Return one member's state in the same form as UniverseBootstrap.get_state"""
+        return {
+            'field': self.field[member].copy(),
+            'temperature': self.temperature[member],
+            'xi': self.correlation_length[member],
+            'bootstrapped': bool(self.bootstrapped[member]),
+            'time': int(self.time[member])
+        }
+
+
+if __name__ == '__main__':
+    members = 32
+    steps = 3000
+    print("="*70)
+    print(f"UNIVERSE BOOTSTRAP ENSEMBLE - {members} members, {steps} steps")
+    print("="*70)
+
+    # Sweep cooling rate across the ensemble
+    ensemble = UniverseEnsemble(members, cooling_rate=np.linspace(4.0, 12.0, members))
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        ensemble.step()
+    elapsed = time.perf_counter() - start
+
+    for i in range(members):
+        print(f"Member {i:3d}: cooling={ensemble.cooling_rate[i]:5.2f}  "
+              f"bootstrap step={ensemble.bootstrap_step[i]:5d}  "
+              f"final variance={ensemble.field[i].var():.4f}")
+    print()
+    print(f"{members * steps / elapsed:.0f} member-steps/sec")
+    print("="*70)
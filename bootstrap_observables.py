@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+STREAMING OBSERVABLES
+What the field actually looks like, measured as the simulation runs
+
+calculate_xi(T) is the correlation length the noise is generated with. The
+structure in the field is measured here from one rFFT per observation:
+    S(k)             radially averaged structure factor <|phi_k|^2> / N
+    xi (measured)    correlation length read off the mean wavenumber of S(k)
+    variance         spatial variance of the field
+    gradient energy  mean of (1/2)|grad phi|^2 (forward differences)
+The rFFT geometry (radial bin of every mode, half-plane weights, stencil
+eigenvalues) is computed once, so an observation costs one rFFT and a few
+weighted sums (np.bincount), and observing every few steps costs a few
+percent of the step time.
+
+The measured xi is calibrated against the noise filter: a field that is pure
+correlated noise at correlation length xi measures xi (in expectation). It
+saturates below about one cell and above about a quarter of the grid.
+
+HysteresisTrigger turns a noisy measured xi into a clean threshold crossing.
+"""
+
+import sys
+
+import numpy as np
+from scipy.fft import rfft2
+
+from bootstrap_noise import gaussian_transfer_1d
+
+CALIBRATION_POINTS = 64  # xi values in the measured-xi calibration table
+OBSERVATION_DTYPE = np.dtype([('time', np.int64), ('temperature', np.float64), ('xi', np.float64),
+                              ('xi_measured', np.float64), ('variance', np.float64),
+                              ('gradient_energy', np.float64)])
+
+
+class Observables:
+    """Structure factor, measured xi, variance and gradient energy of size x size fields
+
+    measure(field) returns one observation; record() also appends it to the
+    series (and S(k) to spectra), which save() writes out as .npz.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        n = size
+        ky = np.fft.fftfreq(n) * n
+        kx = np.fft.rfftfreq(n) * n
+        radius = np.hypot(ky[:, None], kx[None, :])
+
+        # Modes of the rFFT half-plane stand for themselves and their conjugates
+        weights = np.full(radius.shape, 2.0)
+        weights[:, 0] = 1.0
+        if n % 2 == 0:
+            weights[:, -1] = 1.0
+        weights[0, 0] = 0.0  # The mean is not structure
+        self.weights = weights.ravel()
+        # Radial bins of integer |k| up to the Nyquist circle (corners excluded)
+        self.bins = np.rint(radius).astype(np.intp).ravel()
+        self.nbins = n // 2 + 1
+        self.ring_weights = np.where(radius.ravel() <= n // 2, self.weights, 0.0)
+        self.counts = np.bincount(self.bins, weights=self.ring_weights, minlength=self.nbins)[:self.nbins]
+        self.k = 2 * np.pi * np.arange(self.nbins) / n
+        # Eigenvalues of -lap (forward-difference |grad|^2) on each mode, pre-weighted
+        stencil = 4 * np.sin(np.pi * ky / n)[:, None]**2 + 4 * np.sin(np.pi * kx / n)[None, :]**2
+        self.gradient_weights = self.weights * stencil.ravel()
+
+        self._calibration = self.calibrate()
+        self.series = []
+        self.spectra = []
+
+    def structure_factor(self, power):
+        """Radial average of the mode powers |phi_k|^2 / N (flattened half-plane)"""
+        rings = np.bincount(self.bins, weights=power * self.ring_weights, minlength=self.nbins)
+        spectrum = np.zeros(self.nbins)
+        np.divide(rings[:self.nbins], self.counts, out=spectrum, where=self.counts > 0)
+        return spectrum / self.size**2
+
+    def mean_wavenumber(self, spectrum):
+        """S-weighted mean |k| over k > 0"""
+        return float(self.k[1:] @ spectrum[1:] / spectrum[1:].sum())
+
+    def calibrate(self):
+        """(mean wavenumber, xi) table of pure correlated noise, in increasing mean wavenumber"""
+        xis = np.geomspace(0.3, self.size / 2, CALIBRATION_POINTS)
+        means = np.empty_like(xis)
+        n = self.size
+        for i, xi in enumerate(xis):
+            hx = gaussian_transfer_1d(xi / 3.0, n)
+            hy = np.concatenate([hx, hx[1:(n + 1) // 2][::-1]])
+            power = (hy[:, None] * hx[None, :])**2 * n**2  # Expected |phi_k|^2 of filtered unit noise
+            means[i] = self.mean_wavenumber(self.structure_factor(power.ravel()))
+        return means[::-1], xis[::-1]
+
+    def measure(self, field):
+        """One observation of field: (S(k), measured xi, variance, gradient energy)"""
+        spectrum = rfft2(field)
+        power = np.square(spectrum.real, dtype=np.float64) + np.square(spectrum.imag, dtype=np.float64)
+        power = power.ravel()
+        cells = float(self.size)**2
+        structure = self.structure_factor(power)
+        xi = float(np.interp(self.mean_wavenumber(structure), *self._calibration))
+        variance = float(power @ self.weights) / cells**2
+        gradient_energy = 0.5 * float(power @ self.gradient_weights) / cells**2
+        return structure, xi, variance, gradient_energy
+
+    def record(self, time, temperature, xi, field):
+        """Measure field and append the observation (with the analytic xi) to the series"""
+        structure, xi_measured, variance, gradient_energy = self.measure(field)
+        self.series.append((time, temperature, xi, xi_measured, variance, gradient_energy))
+        self.spectra.append(structure)
+        return xi_measured
+
+    def latest(self):
+        """The last recorded observation as a dict of OBSERVATION_DTYPE fields"""
+        return dict(zip(OBSERVATION_DTYPE.names, self.series[-1]))
+
+    def arrays(self):
+        """The series as an OBSERVATION_DTYPE array and the spectra as (observations, k) rows"""
+        return (np.array(self.series, dtype=OBSERVATION_DTYPE),
+                np.array(self.spectra, dtype=np.float64).reshape(-1, self.nbins))
+
+    def restore(self, series, spectra):
+        """Replace the recorded observations (e.g. from a checkpoint)"""
+        self.series = [tuple(row) for row in series.tolist()]
+        self.spectra = list(spectra)
+
+    def save(self, path):
+        """Write the series (one array per column), S(k, t) and k to path (.npz)"""
+        series, spectra = self.arrays()
+        np.savez(path, k=self.k, structure_factor=spectra,
+                 **{name: series[name] for name in OBSERVATION_DTYPE.names})
+
+
+class HysteresisTrigger:
+    """Rising threshold crossing of a noisy signal, with a hysteresis band
+
+    Fires when the value reaches threshold * (1 + band), but only once it has
+    been armed by a value at or below threshold * (1 - band). Fluctuations
+    around the threshold cannot fire it, and neither can a first reading
+    that is already high.
+    """
+
+    def __init__(self, threshold, band):
+        self.threshold = threshold
+        self.band = band
+        self.armed = False
+        self.fired = False
+
+    def update(self, value):
+        """Feed one reading; returns whether the trigger has fired"""
+        if value <= self.threshold * (1 - self.band):
+            self.armed = True
+        elif self.armed and value >= self.threshold * (1 + self.band):
+            self.fired = True
+        return self.fired
+
+
+if __name__ == '__main__':
+    from scipy.ndimage import gaussian_filter
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 128
+    observables = Observables(size)
+    rng = np.random.default_rng(0)
+    print("="*70)
+    print(f"MEASURED ξ of pure correlated noise on {size}x{size} (10 fields each)")
+    print("="*70)
+    for xi in (1.0, 2.0, 4.0, 8.0, 12.0, 20.0):
+        measured = [observables.measure(gaussian_filter(rng.standard_normal((size, size)),
+                                                        xi / 3.0, mode='wrap'))[1]
+                    for _ in range(10)]
+        print(f"ξ={xi:5.1f}: measured {np.mean(measured):6.2f} ± {np.std(measured):.2f}")
+    print("="*70)
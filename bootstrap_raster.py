@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+FIELD RASTER EXPORT
+Colored field images without matplotlib's figure/savefig stack
+
+The field is quantized to 256 levels between vmin and vmax (the binning
+imshow applies to a 256-entry colormap) and colored through an RGBA lookup
+table taken once from the colormap. PNGs are written directly from the array with zlib. An optional
+status strip under the field shows the temperature and xi progress bars and
+the phase color of the full frames, and T, xi, time and phase are stored
+exactly as PNG text chunks. Field-only frames are written as palette PNGs
+whose palette is the lookup table itself.
+"""
+
+import os
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+from matplotlib import colormaps
+
+from run_bootstrap_sim import UniverseBootstrap, T_INITIAL, T_FINAL, phase_of
+
+FIELD_VMIN = -2.0
+FIELD_VMAX = 2.0
+STRIP_HEIGHT = 12  # Rows of status strip per bar (at scale 1)
+PNG_COMPRESSION = 1  # zlib level: lossless at every level, 1 is much faster than 6
+EXPORT_EVERY = 10  # Steps between exported frames in the bulk export below
+
+PHASE_COLORS = {
+    'PRE-BOOTSTRAP': (0, 0, 255),
+    'APPROACHING': (255, 165, 0),
+    'POST-BOOTSTRAP': (0, 128, 0),
+}
+BAR_BACKGROUND = (211, 211, 211)  # lightgray
+TEMP_COLOR = (255, 69, 0)  # orangered
+XI_COLORS = ((30, 144, 255), (255, 255, 0), (0, 255, 0))  # dodgerblue, yellow, lime
+
+
+def colormap_lut(cmap='twilight', levels=256):
+    """RGBA lookup table (levels x 4, uint8) for a matplotlib colormap"""
+    return colormaps[cmap].resampled(levels)(np.arange(levels), bytes=True)
+
+
+def write_png(filename, image, palette=None, text=None, compression=PNG_COMPRESSION):
+    """Write an 8-bit PNG straight from an array, with optional tEXt entries
+
+    image is (h, w, 3) RGB, (h, w, 4) RGBA, or (h, w) palette indices with
+    palette an (n, 3) uint8 color table.
+    """
+    height, width = image.shape[:2]
+    if palette is not None:
+        color_type = 3
+    else:
+        color_type = {3: 2, 4: 6}[image.shape[2]]
+    # Every scanline gets filter type 0 (none)
+    rows = np.zeros((height, image[0].size + 1), dtype=np.uint8)
+    rows[:, 1:] = image.reshape(height, -1)
+
+    def chunk(kind, data):
+        return (struct.pack('>I', len(data)) + kind + data +
+                struct.pack('>I', zlib.crc32(kind + data)))
+
+    with open(filename, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0)))
+        if palette is not None:
+            f.write(chunk(b'PLTE', np.ascontiguousarray(palette, dtype=np.uint8).tobytes()))
+        for key, value in (text or {}).items():
+            f.write(chunk(b'tEXt', f'{key}\0{value}'.encode('latin-1')))
+        f.write(chunk(b'IDAT', zlib.compress(rows.data, compression)))
+        f.write(chunk(b'IEND', b''))
+
+
+class FieldRaster:
+    """Direct field-to-PNG renderer
+
+    scale repeats each cell into a scale x scale block (nearest neighbour).
+    """
+
+    def __init__(self, cmap='twilight', vmin=FIELD_VMIN, vmax=FIELD_VMAX,
+                 status_strip=True, scale=1):
+        self.lut = colormap_lut(cmap)
+        # One uint32 per color, so the lookup gathers whole pixels
+        self.lut_words = self.lut.view(np.uint32).ravel()
+        self.levels = len(self.lut)
+        self.vmin = vmin
+        self.vmax = vmax
+        self.status_strip = status_strip
+        self.scale = scale
+
+    def quantize(self, field):
+        """uint8 colormap index of every cell (scaled up), binned as imshow's Normalize does"""
+        scaled = (field - self.vmin) * (self.levels / (self.vmax - self.vmin))
+        np.clip(scaled, 0, self.levels - 1, out=scaled)
+        index = scaled.astype(np.uint8)
+        if self.scale > 1:
+            index = index.repeat(self.scale, axis=0).repeat(self.scale, axis=1)
+        return index
+
+    def colorize(self, field):
+        """(h, w, 3) uint8 RGB image of the field"""
+        pixels = self.lut_words[self.quantize(field)]
+        return pixels.view(np.uint8).reshape(pixels.shape + (4,))[..., :3]
+
+    def strip(self, universe, width):
+        """Status strip: temperature bar, xi bar and a phase-colored band"""
+        height = STRIP_HEIGHT * self.scale
+        strip = np.full((3 * height, width, 3), 255, dtype=np.uint8)
+
+        temp_fraction = (T_INITIAL - universe.temperature) / (T_INITIAL - T_FINAL)
+        xi_critical = universe.xi_critical
+        xi_fraction = min(universe.correlation_length / (xi_critical * 1.5), 1.0)
+        xi_level = (2 if universe.correlation_length >= xi_critical else
+                    1 if universe.correlation_length > xi_critical * 0.7 else 0)
+        bars = ((temp_fraction, TEMP_COLOR), (xi_fraction, XI_COLORS[xi_level]))
+        for row, (fraction, color) in enumerate(bars):
+            band = strip[row * height + 1:(row + 1) * height - 1]
+            band[...] = BAR_BACKGROUND
+            band[:, :int(round(width * min(max(fraction, 0.0), 1.0)))] = color
+        strip[2 * height:] = PHASE_COLORS[phase_of(universe)]
+        return strip
+
+    def render(self, universe):
+        """RGB frame image for the universe's current state"""
+        image = self.colorize(universe.field)
+        if self.status_strip:
+            image = np.concatenate([image, self.strip(universe, image.shape[1])])
+        return image
+
+    def save(self, universe, filename):
+        """Write the universe's current frame to filename as PNG
+
+        Without the status strip the image is stored as palette indices with
+        the lookup table as the PNG palette: one byte per pixel instead of three.
+        """
+        text = {
+            'Time': universe.time,
+            'Temperature': repr(float(universe.temperature)),
+            'Xi': repr(float(universe.correlation_length)),
+            'Phase': phase_of(universe),
+        }
+        if self.status_strip:
+            write_png(filename, self.render(universe), text=text)
+        else:
+            write_png(filename, self.quantize(universe.field), palette=self.lut[:, :3], text=text)
+
+
+if __name__ == '__main__':
+    out_dir = sys.argv[1] if len(sys.argv) > 1 else '/home/claude/raster'
+    steps = 3000
+    os.makedirs(out_dir, exist_ok=True)
+    print("="*70)
+    print(f"FIELD RASTER EXPORT - every {EXPORT_EVERY} steps of {steps} to {out_dir}")
+    print("="*70)
+
+    universe = UniverseBootstrap()
+    raster = FieldRaster()
+    render_time = 0.0
+    frames = 0
+    for step in range(0, steps, EXPORT_EVERY):
+        universe.advance(EXPORT_EVERY, stop_on_bootstrap=False)
+        start = time.perf_counter()
+        raster.save(universe, os.path.join(out_dir, f'field_{step:04d}.png'))
+        render_time += time.perf_counter() - start
+        frames += 1
+
+    print(f"{frames} frames, {frames / render_time:.0f} frames/sec rendered")
+    print("="*70)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+RECURSIVE GAUSSIAN FILTER
+Periodic Gaussian smoothing whose cost per cell does not depend on sigma
+
+gaussian_filter convolves with a kernel truncated at 4 sigma, so its cost
+grows linearly with xi. This filter approximates the Gaussian with a
+third-order recursive filter in the Young-van Vliet form: a causal and an
+anticausal pass of
+    w[i] = B * x[i] - a1 * w[i-1] - a2 * w[i-2] - a3 * w[i-3]
+along each axis. That is a fixed handful of operations per cell for any sigma.
+
+Periodic boundaries are exact, not padded. A recursive pass over a periodic
+signal has a periodic steady state, fixed by its initial filter state z. One
+pass from zero state leaves a final state f, and the zero-input response of
+the filter maps z to the state A z after one period, so the steady state
+satisfies z = A z + f. That 3x3 system is solved per row or column, and the
+homogeneous response to z is added to the zero-state output. Both depend only
+on sigma and the axis length, so they are set up once per sigma.
+
+Below RECURSIVE_MIN_SIGMA the truncated kernel is at most 49 cells wide. It
+is both exact and faster than the recursive passes there, so gaussian_filter
+is used directly. The cost per cell is therefore bounded for every sigma.
+
+python bootstrap_recursive.py compares the filter with gaussian_filter.
+"""
+
+import sys
+import time
+
+import numpy as np
+from scipy.ndimage import gaussian_filter
+from scipy.signal import lfilter
+
+RECURSIVE_MIN_SIGMA = 6.0  # Below this sigma the exact truncated kernel is used (it is cheaper there)
+# Poles of the sigma = 2 filter (L2-optimal design); other widths rescale them
+POLES = np.array([1.41650 + 1.00829j, 1.41650 - 1.00829j, 1.86543])
+ORDER = len(POLES)
+NEWTON_STEPS = 8
+
+
+def recursive_gaussian_coefficients(sigma):
+    """(b, a) of the third-order recursive Gaussian for sigma, in lfilter's convention
+
+    The three poles of van Vliet, Young and Verbeek (1998) are scaled as
+    POLES**(1/q). q is solved by Newton's method so that the forward-backward
+    filter's variance is exactly sigma**2 (Young, van Vliet and van Ginkel, 2002).
+    The DC gain is exactly 1: b[0] = sum(a).
+    """
+    log_poles = np.log(POLES)
+    q = sigma / 2.0
+    for _ in range(NEWTON_STEPS):
+        d = POLES ** (1.0 / q)
+        variance = 2 * np.sum(d / (d - 1)**2).real
+        slope = 2 * np.sum(d * (d + 1) * log_poles / (d - 1)**3).real / q**2
+        q -= (variance - sigma**2) / slope
+    a = np.poly(POLES ** (-1.0 / q)).real
+    return np.array([a.sum()]), a
+
+
+class RecursiveGaussian:
+    """Periodic recursive Gaussian filter for size x size grids
+
+    filter(field, sigma, out) matches gaussian_filter(field, sigma,
+    mode='wrap') to within the recursive approximation. It has the same
+    DC gain and variance (sigma**2). The impulse response differs by about
+    2% in L2 norm, and filtered white noise has 1.4% more variance.
+    """
+
+    def __init__(self, size, dtype=np.float64, min_sigma=RECURSIVE_MIN_SIGMA):
+        self.size = size
+        self.dtype = np.dtype(dtype)
+        self.min_sigma = min_sigma
+        self._sigma = None
+        self._periodic = None
+
+    def periodic_solution(self, sigma):
+        """(b, a, solve, homogeneous) for one sigma (cached for the last sigma)
+
+        solve maps the final state of a zero-state pass to the steady-state
+        initial state; homogeneous[:, k] is the output over one period from
+        unit initial state k with zero input.
+        """
+        if sigma != self._sigma:
+            b, a = recursive_gaussian_coefficients(sigma)
+            homogeneous = np.empty((self.size, ORDER))
+            period = np.empty((ORDER, ORDER))
+            for k, state in enumerate(np.eye(ORDER)):
+                homogeneous[:, k], period[:, k] = lfilter(b, a, np.zeros(self.size), zi=state)
+            solve = np.linalg.inv(np.eye(ORDER) - period)
+            self._periodic = b, a, solve, homogeneous
+            self._sigma = sigma
+        return self._periodic
+
+    def _pass(self, lines, sigma):
+        """Periodic steady-state causal pass along the last axis of lines"""
+        b, a, solve, homogeneous = self.periodic_solution(sigma)
+        zero_state = np.zeros(lines.shape[:-1] + (ORDER,))
+        output, final = lfilter(b, a, lines, zi=zero_state)
+        output += (final @ solve.T) @ homogeneous.T
+        return output
+
+    def filter_axis(self, field, sigma, axis):
+        """Causal then anticausal periodic pass along one axis"""
+        lines = np.moveaxis(field, axis, -1)
+        forward = self._pass(lines, sigma)
+        both = self._pass(forward[..., ::-1], sigma)[..., ::-1]
+        return np.moveaxis(both, -1, axis)
+
+    def filter(self, field, sigma, out=None):
+        """Periodic Gaussian filter of field (into out if given, else a new array of its dtype)
+
+        field may be a stack: only its last two axes are filtered.
+        """
+        if out is None:
+            out = np.empty(field.shape, dtype=self.dtype)
+        if sigma < self.min_sigma:
+            sigmas = [0] * (field.ndim - 2) + [sigma, sigma]
+            return gaussian_filter(field, sigma=sigmas, output=out, mode='wrap')
+        smoothed = field
+        for axis in (-2, -1):
+            smoothed = self.filter_axis(smoothed, sigma, axis)
+        out[...] = smoothed
+        return out
+
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 128
+    rng = np.random.default_rng(0)
+    white = rng.standard_normal((size, size))
+    recursive = RecursiveGaussian(size)
+    print("="*70)
+    print(f"RECURSIVE GAUSSIAN vs gaussian_filter on {size}x{size} white noise (mode='wrap')")
+    print("="*70)
+    for sigma in (1.0, 2.0, 4.0, 8.0, 18.5, 40.0):
+        timings = []
+        for smooth in (lambda: gaussian_filter(white, sigma, mode='wrap'),
+                       lambda: recursive.filter(white, sigma)):
+            start = time.perf_counter()
+            for _ in range(5):
+                result = smooth()
+            timings.append((time.perf_counter() - start) / 5)
+            if len(timings) == 1:
+                exact = result
+        error = np.sqrt(np.mean((result - exact)**2) / np.mean(exact**2))
+        print(f"sigma={sigma:5.1f}: gaussian_filter {timings[0] * 1e3:7.2f} ms, "
+              f"recursive {timings[1] * 1e3:6.2f} ms, relative RMS difference {error:.1e}")
+    print("="*70)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+PARAMETER SWEEP
+Many independent bootstrap runs over a grid of cooling rate, XI_CRITICAL,
+grid size and seed, farmed out to a process pool
+
+Runs are submitted longest first (cost ~ size**2 * steps) so the big grids
+start immediately and small ones fill in the gaps at the end. Workers come
+from a forkserver that has numpy, scipy and the simulation already imported,
+so each run starts warm. Each run is single-threaded inside its worker, so
+the sweep scales with the number of workers. Every finished run is appended to one columnar
+results file (.npz, one array per column), rewritten atomically as results
+stream in, so partial sweeps are readable while they run.
+
+Runs with the same seed share their random stream, so differences between
+configurations are not seed-to-seed noise.
+"""
+
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from run_bootstrap_sim import UniverseBootstrap
+
+SWEEP = {
+    'cooling_rate': [4.0, 6.0, 8.0, 12.0],
+    'xi_critical': [5.0, 8.0, 10.0],
+    'size': [64, 128, 256],
+}
+SEEDS = [0, 1, 2, 3]
+STEPS = 3000
+SWEEP_WORKERS = os.cpu_count()
+RESULTS_PATH = '/home/claude/sweep_results.npz'
+FLUSH_EVERY = 16  # Finished runs between rewrites of the results file
+PRELOAD = ['numpy', 'scipy.ndimage', 'scipy.fft', 'run_bootstrap_sim']
+
+COLUMNS = ['cooling_rate', 'xi_critical', 'size', 'seed', 'steps', 'bootstrap_step',
+           'bootstrap_variance', 'final_variance', 'wall_time', 'steps_per_sec']
+
+
+def sweep_configs(sweep=SWEEP, seeds=SEEDS, steps=STEPS):
+    """Every combination of the sweep values and seeds, as run_config keyword dicts"""
+    names = list(sweep)
+    return [dict(zip(names, values), seed=seed, steps=steps)
+            for values in itertools.product(*sweep.values()) for seed in seeds]
+
+
+def run_cost(config):
+    """Relative cost of a run: cells times steps"""
+    return config['size']**2 * config['steps']
+
+
+def run_config(cooling_rate, xi_critical, size, seed, steps, stencil_threads=0, prefetch_depth=0):
+    """One complete run; returns its summary row
+
+    The pool already uses every core, so by default a run starts no stencil
+    or prefetch threads of its own.
+    """
+    start = time.perf_counter()
+    universe = UniverseBootstrap(size, seed=seed, cooling_rate=cooling_rate,
+                                 xi_critical=xi_critical, stencil_threads=stencil_threads,
+                                 prefetch_depth=prefetch_depth)
+    # Stop on the bootstrap step to record the field there, then run out the rest
+    events = universe.advance(steps)
+    bootstrap_step = events['bootstrap'] if events['bootstrap'] is not None else -1
+    bootstrap_variance = universe.field_variance() if bootstrap_step >= 0 else np.nan
+    universe.advance(steps - events['steps'], stop_on_bootstrap=False)
+    wall_time = time.perf_counter() - start
+    return {
+        'cooling_rate': cooling_rate,
+        'xi_critical': xi_critical,
+        'size': size,
+        'seed': seed,
+        'steps': steps,
+        'bootstrap_step': bootstrap_step,
+        'bootstrap_variance': bootstrap_variance,
+        'final_variance': universe.field_variance(),
+        'wall_time': wall_time,
+        'steps_per_sec': steps / wall_time,
+    }
+
+
+def _run_row(config):
+    return run_config(**config)
+
+
+def write_results(path, rows):
+    """Write rows as one array per column, atomically"""
+    partial = f'{path}.partial'
+    with open(partial, 'wb') as f:
+        np.savez(f, **{name: np.array([row[name] for row in rows]) for name in COLUMNS})
+    os.replace(partial, path)
+
+
+def pool_context():
+    """forkserver with the simulation preloaded where available (POSIX), else the default"""
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context()
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload(PRELOAD)
+    return context
+
+
+def run_sweep(configs, path=RESULTS_PATH, workers=SWEEP_WORKERS, progress=True):
+    """Run every config in a process pool, longest first; returns the result rows
+
+    Rows are in completion order; each carries its own parameters.
+    """
+    ordered = sorted(configs, key=run_cost, reverse=True)
+    rows = []
+    with ProcessPoolExecutor(workers, mp_context=pool_context()) as pool:
+        futures = [pool.submit(_run_row, config) for config in ordered]
+        for done, future in enumerate(as_completed(futures), 1):
+            row = future.result()
+            rows.append(row)
+            if progress:
+                print(f"[{done:5d}/{len(futures)}] size={row['size']:4d} "
+                      f"cooling={row['cooling_rate']:5.2f} xi_c={row['xi_critical']:5.2f} "
+                      f"seed={row['seed']:3d}: bootstrap step={row['bootstrap_step']:5d} "
+                      f"final variance={row['final_variance']:.4f} ({row['wall_time']:.1f}s)")
+            if done % FLUSH_EVERY == 0:
+                write_results(path, rows)
+    write_results(path, rows)
+    return rows
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else RESULTS_PATH
+    configs = sweep_configs()
+    print("="*70)
+    print(f"PARAMETER SWEEP - {len(configs)} runs of {STEPS} steps on {SWEEP_WORKERS} workers")
+    print("="*70)
+
+    start = time.perf_counter()
+    rows = run_sweep(configs, path)
+    elapsed = time.perf_counter() - start
+
+    busy = sum(row['wall_time'] for row in rows)
+    print()
+    print(f"{len(rows)} runs in {elapsed:.1f}s ({busy / elapsed:.1f} runs' worth of work in parallel)")
+    print(f"Results: {path}")
+    print("="*70)
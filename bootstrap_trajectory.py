@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+TRAJECTORY STORE
+Field snapshots on disk as chunked, memory-mapped arrays
+
+A trajectory is a directory:
+    trajectory.json     size, dtype, chunk length and snapshot count
+    fields_NNNNN.npy    (chunk, size, size) field snapshots
+    meta_NNNNN.npy      (chunk,) records of step, time, T, xi and phase
+Each chunk is a regular .npy file, written and read through np.memmap, so a
+trajectory can be far larger than RAM and any snapshot or step range is read
+without touching the rest. The snapshot count in trajectory.json is only
+advanced once the data it covers has been flushed.
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from run_bootstrap_sim import phase_of
+
+CHUNK_BYTES = 64 * 2**20  # Target size of one fields_NNNNN.npy chunk
+HEADER = 'trajectory.json'
+PHASES = ('PRE-BOOTSTRAP', 'APPROACHING', 'POST-BOOTSTRAP')
+META_DTYPE = np.dtype([('step', np.int64), ('time', np.int64), ('temperature', np.float64),
+                       ('xi', np.float64), ('phase', np.uint8)])
+
+
+def chunk_files(path, chunk):
+    """Field and metadata file names of chunk number `chunk`"""
+    return (os.path.join(path, f'fields_{chunk:05d}.npy'),
+            os.path.join(path, f'meta_{chunk:05d}.npy'))
+
+
+class TrajectoryWriter:
+    """Append field snapshots of one run to a trajectory directory
+
+    resume_count reopens an existing trajectory of the same shape and dtype
+    and continues after its first resume_count snapshots (e.g. the count
+    stored in a checkpoint), dropping anything written after them.
+    """
+
+    def __init__(self, path, size, dtype=np.float64, chunk=None, resume_count=None):
+        self.path = path
+        self.size = size
+        self.dtype = np.dtype(dtype)
+        self.chunk = chunk or max(1, CHUNK_BYTES // (size * size * self.dtype.itemsize))
+        self.count = 0
+        self._valid = 0  # Snapshots already on disk that must be kept
+        self._fields = None
+        self._meta = None
+        self._open_chunk = None
+
+        os.makedirs(path, exist_ok=True)
+        if resume_count is not None:
+            with open(os.path.join(path, HEADER)) as f:
+                header = json.load(f)
+            if (header['size'], header['dtype']) != (size, self.dtype.name):
+                raise ValueError(f"Trajectory {path} holds {header['size']}x{header['size']} "
+                                 f"{header['dtype']} fields, not {size}x{size} {self.dtype.name}")
+            if resume_count > header['count']:
+                raise ValueError(f"Trajectory {path} has {header['count']} snapshots, "
+                                 f"cannot resume after {resume_count}")
+            self.chunk = header['chunk']
+            self.count = self._valid = resume_count
+        self._write_header()
+
+    def _write_header(self):
+        header = {'size': self.size, 'dtype': self.dtype.name,
+                  'chunk': self.chunk, 'count': self.count}
+        partial = os.path.join(self.path, HEADER + '.partial')
+        with open(partial, 'w') as f:
+            json.dump(header, f)
+        os.replace(partial, os.path.join(self.path, HEADER))
+
+    def _map_chunk(self, chunk):
+        """Memory-map chunk number `chunk` for writing
+
+        Chunks holding kept snapshots are reopened; any other chunk file
+        (including leftovers of an earlier run) is created afresh.
+        """
+        if chunk == self._open_chunk:
+            return
+        self.flush()
+        fields_file, meta_file = chunk_files(self.path, chunk)
+        shape = (self.chunk, self.size, self.size)
+        if chunk * self.chunk < self._valid:
+            self._fields = open_memmap(fields_file, mode='r+')
+            self._meta = open_memmap(meta_file, mode='r+')
+        else:
+            self._fields = open_memmap(fields_file, mode='w+', dtype=self.dtype, shape=shape)
+            self._meta = open_memmap(meta_file, mode='w+', dtype=META_DTYPE, shape=shape[:1])
+        self._open_chunk = chunk
+
+    def append(self, universe, step):
+        """Store the universe's current field and state as the snapshot for `step`"""
+        chunk, offset = divmod(self.count, self.chunk)
+        self._map_chunk(chunk)
+        self._fields[offset] = universe.field
+        self._meta[offset] = (step, universe.time, universe.temperature,
+                              universe.correlation_length, PHASES.index(phase_of(universe)))
+        self.count += 1
+        if offset == self.chunk - 1:
+            self.flush()
+
+    def flush(self):
+        """Write mapped data to disk, then publish the new snapshot count"""
+        if self._fields is not None:
+            self._fields.flush()
+            self._meta.flush()
+        self._write_header()
+
+    def close(self):
+        self.flush()
+        self._fields = self._meta = self._open_chunk = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Trajectory:
+    """Read-only, random-access view of a trajectory directory
+
+    traj[step] is the field snapshot recorded at simulation step `step`, and
+    traj[start:stop:stride] stacks the snapshots whose steps fall in that
+    range (stride in simulation steps). Only the chunks that hold the
+    requested snapshots are mapped, and only the requested rows are read.
+    traj.snapshot(i) and traj.metadata address snapshots by position.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, HEADER)) as f:
+            header = json.load(f)
+        self.size = header['size']
+        self.dtype = np.dtype(header['dtype'])
+        self.chunk = header['chunk']
+        self.count = header['count']
+        self._fields = {}
+
+        chunks = -(-self.count // self.chunk)
+        self.metadata = np.concatenate(
+            [np.load(chunk_files(path, c)[1]) for c in range(chunks)]
+            or [np.empty(0, META_DTYPE)])[:self.count]
+        self.steps = self.metadata['step']
+
+    def __len__(self):
+        return self.count
+
+    def _chunk_fields(self, chunk):
+        if chunk not in self._fields:
+            self._fields[chunk] = np.load(chunk_files(self.path, chunk)[0], mmap_mode='r')
+        return self._fields[chunk]
+
+    def snapshot(self, index):
+        """Field of the index-th snapshot (a read-only memory-mapped view)"""
+        if not -self.count <= index < self.count:
+            raise IndexError(f"Snapshot {index} out of range for {self.count} snapshots")
+        chunk, offset = divmod(index % self.count, self.chunk)
+        return self._chunk_fields(chunk)[offset]
+
+    def phase(self, index):
+        """Phase label of the index-th snapshot"""
+        return PHASES[self.metadata['phase'][index]]
+
+    def indices(self, steps):
+        """Snapshot positions of the steps selected by a slice of simulation steps"""
+        start = steps.start if steps.start is not None else 0
+        stop = steps.stop if steps.stop is not None else np.iinfo(np.int64).max
+        stride = steps.step or 1
+        selected = (self.steps >= start) & (self.steps < stop) & ((self.steps - start) % stride == 0)
+        return np.flatnonzero(selected)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            indices = self.indices(key)
+            out = np.empty((len(indices), self.size, self.size), dtype=self.dtype)
+            for i, index in enumerate(indices):
+                out[i] = self.snapshot(index)
+            return out
+        index = np.searchsorted(self.steps, key)
+        if index == self.count or self.steps[index] != key:
+            raise KeyError(f"No snapshot recorded at step {key}")
+        return self.snapshot(index)
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else '/home/claude/trajectory'
+    traj = Trajectory(path)
+    print("="*70)
+    print(f"TRAJECTORY {path} - {len(traj)} snapshots of {traj.size}x{traj.size} {traj.dtype}")
+    print("="*70)
+    for index in range(len(traj)):
+        meta = traj.metadata[index]
+        print(f"Step {meta['step']:5d}: T={meta['temperature']:6.2f}, ξ={meta['xi']:6.2f}, "
+              f"variance={traj.snapshot(index).var(dtype=np.float64):.4f} [{traj.phase(index)}]")
+    print("="*70)
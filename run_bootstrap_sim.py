@@ -4,10 +4,34 @@ UNIVERSE BOOTSTRAP SIMULATION - Frame Capture Version
 Saves key frames showing the bootstrap process
 """
 
+import os
+import json
+import pickle
+import signal
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+import matplotlib.image as mpimg
+from matplotlib import cbook
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+try:
+    from matplotlib._tight_bbox import adjust_bbox
+except ImportError:  # matplotlib < 3.6
+    from matplotlib.tight_bbox import adjust_bbox
 from scipy.ndimage import gaussian_filter
+from bootstrap_noise import (SpectralNoise, MultiresNoise, make_rng, quantize_scale, batch_runs,
+                             quantization_effect)
+from bootstrap_backends import make_backend, l2_norm
+from bootstrap_recursive import RecursiveGaussian
+from bootstrap_prefetch import NoisePrefetcher
+from bootstrap_observables import Observables, HysteresisTrigger
+from bootstrap_capture import CaptureScheduler
+from bootstrap_etd import SpectralETD
 
 # Constants
 GRID_SIZE = 128
@@ -17,36 +41,254 @@ T_FINAL = 0.1
 COOLING_RATE = 8.0  # Fast cooling to hit bootstrap for sure
 XI_CRITICAL = 8.0  # Will definitely hit this!
 NOISE_AMPLITUDE = 1.0
+NOISE_MODE = 'filter'  # 'filter' (gaussian_filter), 'spectral' (FFT), 'recursive' (IIR) or 'multires' (coarse-grid FFT)
+FAST_FORWARD = False  # Sample the bootstrap-step field in one shot instead of stepping to it
+BUFFER_ARENA = True  # Reuse preallocated work arrays instead of allocating temporaries every step
+DTYPE = np.float64  # Field/noise precision: np.float64 or np.float32 (see bootstrap_precision.py)
+INTEGRATOR = 'euler'  # Post-bootstrap integrator: 'euler' (explicit) or 'etd' (spectral exponential)
+ETD_STEP = 10  # Steps covered by one ETD step inside advance()
+PREFETCH_DEPTH = 3  # Noise buffers (in use plus filled ahead) of advance()'s worker thread: 0 generates inline, else at least 2
+NOISE_BATCH = 8  # Noise fields of equal (quantized) xi generated per call inside advance()
+NOISE_BATCH_BYTES = 16 * 2**20  # Cap on one batch's size: large grids batch fewer fields
+SIGMA_TOLERANCE = 0.0  # Relative sigma quantization for noise batching (0: exact, only equal xi batch)
+BACKEND = 'numpy'  # Step kernels with BUFFER_ARENA: 'numpy' or 'numba' (see bootstrap_backends.py)
+STENCIL_THREADS = os.cpu_count()  # Kernel threads: tiled numpy stencil (0 disables tiling) or numba
+OBSERVE_EVERY = 10  # Steps between observations of S(k), measured ξ, variance and gradient energy (0 disables)
+BOOTSTRAP_TRIGGER = 'analytic'  # Bootstrap when 'analytic' ξ(T) or the 'measured' ξ of the field reaches XI_CRITICAL
+XI_HYSTERESIS = 0.1  # Relative band around XI_CRITICAL that the measured ξ must leave to arm/fire the trigger
+STOP_AFTER_BOOTSTRAP = None  # End the run this many steps after bootstrap (None: run every step)
+STEADY_TOLERANCE = None  # End the run once ||Δφ||/||φ|| stays below this for STEADY_WINDOW steps (None disables)
+STEADY_WINDOW = 100  # Consecutive post-bootstrap steps the residual must stay below STEADY_TOLERANCE
+WALL_CLOCK_BUDGET = None  # End the run after this many seconds (None: no limit)
+SEED = None  # Seed of each run's random stream (None: fresh entropy every run)
+BIT_GENERATOR = 'pcg64'  # 'pcg64' or 'philox' (counter-based)
+RENDER_WORKERS = os.cpu_count()  # Frame-rendering processes (0 renders inline in the simulation loop)
+RENDER_BACKLOG = 16  # Frames queued or rendering before the simulation waits (backpressure)
+CHECKPOINT_PATH = None  # Checkpoint file, resumed from if present (e.g. '/home/claude/bootstrap_checkpoint.npz'; None disables)
+TRAJECTORY_PATH = None  # Field snapshot store directory (bootstrap_trajectory.py; None disables)
+OBSERVABLES_PATH = None  # .npz file for the observation series and S(k, t) (None: not saved)
+TRAJECTORY_EVERY = 10  # Steps between stored field snapshots
+DOMAINS_PATH = None  # .npz file for sign-domain tracking (bootstrap_domains.py; None disables)
+DOMAIN_EVERY = 50  # Steps between domain-tracking snapshots
+CHECKPOINT_EVERY = 500  # Steps between automatic checkpoints (also the SIGTERM response time)
+CAPTURE_SPARSE_EVERY = 200  # Steps between frames outside event windows (see bootstrap_capture.py)
+CAPTURE_EVERY = 5  # Steps between ring snapshots, and between frames around an event
+CAPTURE_RING = 16  # Snapshots kept for the frames before an event (0: frames after it only)
+CAPTURE_AFTER = 60  # Steps of dense frames after an event
+CAPTURE_QUANTIZE = True  # Keep ring snapshots as 16-bit quantized copies instead of exact ones
+FRAME_DPI = 120
+SUBPLOT_PARAMS = ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')
 
 class UniverseBootstrap:
     """Simulate universe bootstrap from pure potential"""
     
-    def __init__(self, size=GRID_SIZE):
+    def __init__(self, size=GRID_SIZE, noise_mode=NOISE_MODE, buffer_arena=BUFFER_ARENA,
+                 dtype=DTYPE, integrator=INTEGRATOR, etd_step=ETD_STEP, seed=SEED,
+                 bit_generator=BIT_GENERATOR, cooling_rate=COOLING_RATE, xi_critical=XI_CRITICAL,
+                 stencil_threads=STENCIL_THREADS, backend=BACKEND, prefetch_depth=PREFETCH_DEPTH,
+                 noise_batch=NOISE_BATCH, sigma_tolerance=SIGMA_TOLERANCE,
+                 observe_every=OBSERVE_EVERY, bootstrap_trigger=BOOTSTRAP_TRIGGER,
+                 xi_hysteresis=XI_HYSTERESIS, residual_tolerance=STEADY_TOLERANCE):
+        if noise_mode not in ('filter', 'spectral', 'recursive', 'multires'):
+            raise ValueError(f"Unknown noise mode: {noise_mode!r}")
+        if integrator not in ('euler', 'etd'):
+            raise ValueError(f"Unknown integrator: {integrator!r}")
+        if np.dtype(dtype) not in (np.float32, np.float64):
+            raise ValueError(f"Unsupported dtype: {dtype!r}")
+        if bootstrap_trigger not in ('analytic', 'measured'):
+            raise ValueError(f"Unknown bootstrap trigger: {bootstrap_trigger!r}")
+        if prefetch_depth == 1 or prefetch_depth < 0:
+            raise ValueError(f"Prefetch depth must be 0 (inline) or at least 2, got {prefetch_depth}")
+        if bootstrap_trigger == 'measured' and not observe_every:
+            raise ValueError("The measured bootstrap trigger needs observations (observe_every > 0)")
         self.size = size
-        self.field = np.random.randn(size, size) * 0.1
+        self.noise_mode = noise_mode
+        self.dtype = np.dtype(dtype)
+        self.cooling_rate = cooling_rate
+        self.xi_critical = xi_critical
+        # Every draw of this universe comes from its own Generator, in the working dtype
+        self.bit_generator = bit_generator
+        self.rng = make_rng(seed, bit_generator)
+        # Spectral modes: the noise (and nothing else) comes from a spectral sampler
+        self.spectral_noise = None
+        if noise_mode == 'spectral':
+            self.spectral_noise = SpectralNoise(size, dtype, self.rng)
+        elif noise_mode == 'multires':
+            self.spectral_noise = MultiresNoise(size, dtype, self.rng)
+        self.recursive_filter = RecursiveGaussian(size, dtype) if noise_mode == 'recursive' else None
+        self.field = self.rng.standard_normal((size, size), dtype=self.dtype)
+        self.field *= 0.1
+        
+        # Spectral ETD integrator: Laplacian exact, cubic term explicit, noise in the same pass
+        self.integrator = integrator
+        self.etd_step = etd_step
+        self.etd = None
+        if integrator == 'etd':
+            self.etd = SpectralETD(self.spectral_noise or SpectralNoise(size, dtype, self.rng))
+        
+        # Noise batching: runs of steps whose sigma falls in the same bucket
+        # (relative width sigma_tolerance) share one quantized sigma, and
+        # advance() generates up to noise_batch of their fields per call
+        self.sigma_tolerance = sigma_tolerance
+        self.noise_batch = max(1, min(noise_batch, NOISE_BATCH_BYTES // (size * size * self.dtype.itemsize)))
+        batch_shape = (self.noise_batch, size, size)
+        
+        # Buffer arena: work arrays allocated once and reused by every step, with
+        # the step kernels (and their own scratch) supplied by a pluggable backend
+        self.buffer_arena = buffer_arena
+        self.buffers = None
+        self.backend = None
+        if buffer_arena:
+            self.buffers = {
+                'white': np.empty(batch_shape, dtype=self.dtype),
+                'noise': np.empty((size, size), dtype=self.dtype),
+            }
+            self.backend = make_backend(backend, size, self.dtype, stencil_threads)
+        
+        # Noise prefetch: advance() generates upcoming noise batches on a worker
+        # thread while the field updates run (needs the arena's noise scratch)
+        self.prefetcher = None
+        if buffer_arena and prefetch_depth:
+            self.prefetcher = NoisePrefetcher(self.generate_noise_run, batch_shape,
+                                              self.dtype, prefetch_depth)
+        elif buffer_arena:
+            self.buffers['batch'] = np.empty(batch_shape, dtype=self.dtype)
         self.temperature = T_INITIAL
         self.time = 0
         self.bootstrapped = False
         self.correlation_length = self.calculate_xi(self.temperature)
         
+        # Streaming observables: the field is measured every observe_every steps
+        # (and now); with the measured trigger, its ξ decides the bootstrap step
+        self.observe_every = observe_every
+        self.observables = Observables(size) if observe_every else None
+        self.bootstrap_trigger = bootstrap_trigger
+        self.trigger = None
+        if bootstrap_trigger == 'measured':
+            self.trigger = HysteresisTrigger(xi_critical, xi_hysteresis)
+        if self.observables is not None:
+            self.observe()
+        
+        # Steady state: with a residual tolerance, every post-bootstrap update
+        # measures its residual ||Δφ||/||φ|| from the buffers it already fills,
+        # and steady_steps counts the consecutive steps below the tolerance
+        self.residual_tolerance = residual_tolerance
+        self.residual = None
+        self.steady_steps = 0
+        
     def calculate_xi(self, T):
         """Correlation length: xi ~ 1/T"""
         return 10.0 / (T + 0.1)
     
-    def generate_correlated_noise(self, xi):
-        """Generate noise with correlation length xi"""
-        noise = np.random.randn(self.size, self.size)
-        sigma = xi / 3.0
-        correlated = gaussian_filter(noise, sigma=sigma, mode='wrap')
+    def noise_xi(self, xi):
+        """Correlation length the noise for xi is generated at (quantized by sigma_tolerance)"""
+        return quantize_scale(xi, self.sigma_tolerance)
+    
+    def generate_correlated_noise(self, xi, out=None):
+        """Generate noise with correlation length xi (into out if given)"""
+        if out is not None:
+            return self.generate_noise_batch(xi, out[np.newaxis])[0]
+        sigma = self.noise_xi(xi) / 3.0
+        if self.spectral_noise is not None:
+            correlated = self.spectral_noise.sample(sigma)
+        else:
+            noise = self.rng.standard_normal((self.size, self.size), dtype=self.dtype)
+            if self.recursive_filter is not None:
+                correlated = self.recursive_filter.filter(noise, sigma)
+            else:
+                correlated = gaussian_filter(noise, sigma=sigma, output=self.dtype, mode='wrap')
         return correlated * NOISE_AMPLITUDE
     
-    def update_field_pre_bootstrap(self):
-        """Pre-bootstrap: pure fluctuations"""
+    def generate_noise_batch(self, xi, out):
+        """Fill each field of out (count x size x size) with noise of correlation length xi
+        
+        One draw and one filter (or FFT) call for the whole batch; the fields
+        are identical to those of count successive generate_correlated_noise()
+        calls. Arena only: at most noise_batch fields.
+        """
+        sigma = self.noise_xi(xi) / 3.0
+        if self.spectral_noise is not None:
+            correlated = self.spectral_noise.sample_many(sigma, len(out))
+        else:
+            white = self.rng.standard_normal(dtype=self.dtype, out=self.buffers['white'][:len(out)])
+            if self.recursive_filter is not None:
+                correlated = self.recursive_filter.filter(white, sigma, out)
+            else:
+                correlated = self.backend.filter_noise(white, sigma, out)
+        return np.multiply(correlated, NOISE_AMPLITUDE, out=out)
+    
+    def generate_noise_run(self, run, out):
+        """Noise for a (xi, count) run from batch_runs() into the first count fields of out"""
+        xi, count = run
+        self.generate_noise_batch(xi, out[:count])
+        return out
+    
+    def noise_stream(self, xis):
+        """Yield the noise field for each xi in turn (arena only)
+        
+        Consecutive steps with the same quantized xi are generated together,
+        up to noise_batch fields per call, ahead of use on the prefetch worker
+        when there is one. A yielded field stays valid until the next one is
+        requested; close the generator if it is abandoned early.
+        """
+        runs = batch_runs(self.noise_xi(np.asarray(xis)).tolist(), self.noise_batch)
+        if self.prefetcher is not None:
+            batches = self.prefetcher.stream(runs)
+        else:
+            batches = (self.generate_noise_run(run, self.buffers['batch']) for run in runs)
+        try:
+            for (xi, count), batch in zip(runs, batches):
+                yield from batch[:count]
+        finally:
+            batches.close()
+    
+    def noise_quantization_effect(self, steps):
+        """Effect of sigma_tolerance on the noise of the next `steps` steps (see quantization_effect)"""
+        xis = self.calculate_xi(self.temperature_schedule(steps))
+        return quantization_effect(xis / 3.0, self.sigma_tolerance, self.size)
+    
+    def update_field_pre_bootstrap(self, noise=None):
+        """Pre-bootstrap: pure fluctuations
+        
+        noise is this step's correlated noise if already generated (arena
+        only; it is modified in place).
+        """
+        if self.buffer_arena:
+            if noise is None:
+                noise = self.generate_correlated_noise(self.correlation_length,
+                                                       out=self.buffers['noise'])
+            self.field = self.backend.pre_bootstrap_update(self.field, noise)
+            return
+        
         noise = self.generate_correlated_noise(self.correlation_length)
         self.field = self.field * 0.95 + noise * 0.2
         
-    def update_field_post_bootstrap(self):
-        """Post-bootstrap: observation maintains structure"""
+    def update_field_post_bootstrap(self, steps=1, noise=None):
+        """Post-bootstrap: observation maintains structure
+        
+        With the ETD integrator one call advances the field by `steps` steps at
+        once; the explicit update always advances one step. noise is as in
+        update_field_pre_bootstrap() (explicit update only).
+        """
+        tracking = self.residual_tolerance is not None
+        if self.etd is not None:
+            sigma = self.noise_xi(self.correlation_length) / 3.0
+            previous = self.field
+            self.field = self.etd.step(self.field, steps, sigma, 0.05 * NOISE_AMPLITUDE)
+            if tracking:
+                self.record_residual(l2_norm(self.field - previous), steps)
+            return
+        
+        if self.buffer_arena:
+            if noise is None:
+                noise = self.generate_correlated_noise(self.correlation_length,
+                                                       out=self.buffers['noise'])
+            noise *= 0.05
+            self.field = self.backend.post_bootstrap_update(self.field, noise)
+            if tracking:
+                self.record_residual(self.backend.increment_norm(self.field))
+            return
+        
         field_padded = np.pad(self.field, 1, mode='wrap')
         laplacian = (
             field_padded[:-2, 1:-1] + field_padded[2:, 1:-1] +
@@ -55,16 +297,28 @@ class UniverseBootstrap:
         )
         
         noise = self.generate_correlated_noise(self.correlation_length) * 0.05
-        self.field += 0.1 * laplacian - 0.05 * self.field**3 + noise
+        increment = 0.1 * laplacian - 0.05 * self.field**3 + noise
+        self.field += increment
+        if tracking:
+            self.record_residual(l2_norm(increment))
+    
+    def record_residual(self, change, steps=1):
+        """Count a post-bootstrap update of ||Δφ|| = change over `steps` steps towards steady state"""
+        scale = l2_norm(self.field)
+        self.residual = change / steps / scale if scale else np.inf
+        if self.residual < self.residual_tolerance:
+            self.steady_steps += steps
+        else:
+            self.steady_steps = 0
         
     def step(self):
         """Single simulation step"""
         if self.temperature > T_FINAL:
-            self.temperature -= COOLING_RATE * 0.01
+            self.temperature -= self.cooling_rate * 0.01
         
         self.correlation_length = self.calculate_xi(self.temperature)
         
-        if not self.bootstrapped and self.correlation_length >= XI_CRITICAL:
+        if not self.bootstrapped and self.bootstrap_reached(self.correlation_length):
             self.bootstrapped = True
             return True  # Signal bootstrap happened
         
@@ -74,111 +328,636 @@ class UniverseBootstrap:
             self.update_field_pre_bootstrap()
         
         self.time += 1
+        if self.observables is not None and self.time % self.observe_every == 0:
+            self.observe()
         return False
+    
+    def bootstrap_reached(self, xi):
+        """Whether a step at correlation length xi is the bootstrap step
+        
+        With the measured trigger, it is the first step after the observation
+        that fired it, whatever xi is.
+        """
+        if self.trigger is not None:
+            return self.trigger.fired
+        return xi >= self.xi_critical
+    
+    def observe(self):
+        """Measure the field now and record it; returns the measured ξ"""
+        xi = self.observables.record(self.time, self.temperature, self.correlation_length, self.field)
+        if self.trigger is not None:
+            self.trigger.update(xi)
+        return xi
+    
+    def temperature_schedule(self, steps):
+        """Temperatures after each of the next `steps` calls to step()
+        
+        Same float operations as step()'s repeated subtraction, so the values
+        (and hence the bootstrap step) are bit-identical.
+        """
+        if self.temperature <= T_FINAL:
+            return np.full(steps, self.temperature)
+        decrements = np.full(steps + 1, -(self.cooling_rate * 0.01))
+        decrements[0] = self.temperature
+        temperatures = np.cumsum(decrements)[1:]
+        # Cooling stops on the first step that reaches T_FINAL
+        floor = np.flatnonzero(temperatures <= T_FINAL)
+        if len(floor):
+            temperatures[floor[0]:] = temperatures[floor[0]]
+        return temperatures
+    
+    def advance(self, steps, stop_on_bootstrap=True):
+        """Run up to `steps` steps as one block
+        
+        The temperature/xi schedule for the block is computed up front, and the
+        field updates run in a tight loop without per-step bookkeeping. The
+        block's noise comes from noise_stream(): batched, and prefetched on a
+        worker thread. With the ETD integrator the post-bootstrap part advances
+        etd_step steps per update (its noise uses ξ at the end of each chunk).
+        Returns a record of the block:
+            'steps':     number of step() calls taken (fewer than requested only
+                         when stopping on bootstrap)
+            'bootstrap': offset in the block of the bootstrap step, or None
+            'cooled':    offset of the step where T reached T_FINAL, or None
+        The bootstrap step itself behaves as in step(): no field update and no
+        clock tick.
+        
+        With observations on, the block runs as segments ending at observation
+        times, so the field is observed (and the measured trigger updated) at
+        the same steps as under step().
+        """
+        if self.observables is None:
+            return self.advance_segment(steps, stop_on_bootstrap)
+        record = {'steps': 0, 'bootstrap': None, 'cooled': None}
+        while record['steps'] < steps:
+            segment = min(steps - record['steps'], self.observe_every - self.time % self.observe_every)
+            events = self.advance_segment(segment, stop_on_bootstrap)
+            for key in ('bootstrap', 'cooled'):
+                if record[key] is None and events[key] is not None:
+                    record[key] = record['steps'] + events[key]
+            record['steps'] += events['steps']
+            if stop_on_bootstrap and events['bootstrap'] is not None:
+                break
+        return record
+    
+    def advance_segment(self, steps, stop_on_bootstrap=True):
+        """advance() without observation segments: one schedule, one noise stream
+        
+        Observes the field at the end if the clock lands on an observation time.
+        """
+        if steps <= 0:
+            return {'steps': 0, 'bootstrap': None, 'cooled': None}
+        
+        cooling = self.temperature > T_FINAL
+        temperatures = self.temperature_schedule(steps)
+        xis = self.calculate_xi(temperatures)
+        
+        bootstrap = None
+        if self.bootstrapped:
+            pass
+        elif self.trigger is not None:
+            # Fired by the last observation: this segment opens with the bootstrap step
+            bootstrap = 0 if self.trigger.fired else None
+        else:
+            crossed = np.flatnonzero(xis >= self.xi_critical)
+            if len(crossed):
+                bootstrap = int(crossed[0])
+        taken = bootstrap + 1 if stop_on_bootstrap and bootstrap is not None else steps
+        cooled = None
+        if cooling:
+            floor = np.flatnonzero(temperatures[:taken] <= T_FINAL)
+            if len(floor):
+                cooled = int(floor[0])
+        if self.bootstrapped:
+            pre, post = 0, 0
+        elif bootstrap is None:
+            pre, post = taken, taken
+        else:
+            pre, post = bootstrap, bootstrap + 1
+        
+        xis = xis.tolist()
+        # Every step's noise, in order (ETD draws its own noise in the spectral pass),
+        # generated in batches ahead of the updates
+        noise_xis = xis[:pre] + (xis[post:taken] if self.etd is None else [])
+        noises = None
+        if self.buffer_arena and len(noise_xis) > 1:
+            noises = self.noise_stream(noise_xis)
+        try:
+            for xi in xis[:pre]:
+                self.correlation_length = xi
+                self.update_field_pre_bootstrap(next(noises) if noises is not None else None)
+            if bootstrap is not None:
+                self.bootstrapped = True
+            stride = self.etd_step if self.etd is not None else 1
+            streamed = noises is not None and self.etd is None
+            for start in range(post, taken, stride):
+                chunk = xis[start:min(start + stride, taken)]
+                self.correlation_length = chunk[-1]
+                self.update_field_post_bootstrap(len(chunk), next(noises) if streamed else None)
+        finally:
+            if noises is not None:
+                noises.close()
+        
+        self.temperature = float(temperatures[taken - 1])
+        self.correlation_length = xis[taken - 1]
+        ticks = taken - (bootstrap is not None)
+        self.time += ticks
+        if self.observables is not None and ticks and self.time % self.observe_every == 0:
+            self.observe()
+        return {'steps': taken, 'bootstrap': bootstrap, 'cooled': cooled}
+    
+    def field_variance(self):
+        """Spatial variance of the field, accumulated in float64 whatever the field dtype"""
+        return float(self.field.var(dtype=np.float64))
+    
+    def fast_forward_to_bootstrap(self):
+        """Jump to the bootstrap step by sampling the field in one shot
+        
+        Before bootstrap the update is linear, so after K steps
+            field_K = 0.95**K * field_0 + sum_t 0.2 * 0.95**(K-t) * noise(xi_t)
+        i.e. the current field scaled plus a Gaussian random field whose power
+        spectrum is the weighted sum of the per-step filter spectra. The
+        temperature schedule is replayed exactly as step() would run it.
+        
+        Leaves the universe in the state step() leaves it in on the call that
+        returns True, and returns that call's step index.
+        """
+        if self.bootstrapped:
+            return None
+        if self.trigger is not None:
+            raise ValueError("Fast-forward needs the analytic bootstrap trigger")
+        
+        temperature = self.temperature
+        sigmas = []
+        while True:
+            if temperature > T_FINAL:
+                temperature -= self.cooling_rate * 0.01
+            xi = self.calculate_xi(temperature)
+            if xi >= self.xi_critical:
+                break
+            if temperature <= T_FINAL:
+                raise RuntimeError(f"Bootstrap never happens: ξ={xi:.2f} < {self.xi_critical} at T_FINAL")
+            sigmas.append(self.noise_xi(xi) / 3.0)
+        
+        steps = len(sigmas)
+        if steps:
+            spectral_noise = self.spectral_noise or SpectralNoise(self.size, self.dtype, self.rng)
+            decay = 0.95 ** (2 * np.arange(steps - 1, -1, -1))
+            power = spectral_noise.accumulated_power(sigmas, (0.2 * NOISE_AMPLITUDE)**2 * decay)
+            self.field = self.field * 0.95**steps + spectral_noise.sample_amplitude(np.sqrt(power))
+        
+        self.temperature = temperature
+        self.correlation_length = xi
+        self.bootstrapped = True
+        self.time += steps
+        return steps
 
-def save_frame(universe, filename, frame_num):
-    """Save a single frame"""
-    fig = plt.figure(figsize=(14, 6))
-    
-    # Field visualization
-    ax_field = plt.subplot(1, 2, 1)
-    field_plot = ax_field.imshow(universe.field, cmap='twilight', vmin=-2, vmax=2)
-    ax_field.axis('off')
-    plt.colorbar(field_plot, ax=ax_field, fraction=0.046, pad=0.04)
-    
-    # Status panel
-    ax_status = plt.subplot(1, 2, 2)
-    ax_status.set_xlim(0, 10)
-    ax_status.set_ylim(0, 10)
-    ax_status.axis('off')
-    
-    # Status info
-    y_pos = 9
-    ax_status.text(1, y_pos, f'Frame: {frame_num}', fontsize=12); y_pos -= 0.8
-    ax_status.text(1, y_pos, f'Time: {universe.time} steps', fontsize=12); y_pos -= 0.8
-    ax_status.text(1, y_pos, f'Temperature: {universe.temperature:.2f}', fontsize=12); y_pos -= 0.8
-    ax_status.text(1, y_pos, f'Correlation ξ: {universe.correlation_length:.2f}', fontsize=12); y_pos -= 1.2
-    
-    # Phase status
-    if universe.bootstrapped:
-        ax_status.text(1, y_pos, '⚡ OBSERVATION ACTIVE', fontsize=14, 
-                      fontweight='bold', color='green'); y_pos -= 1
-        ax_status.text(1, y_pos, 'Reality stabilized.\nStructures persist.\nObservation maintains existence.',
-                      fontsize=11, style='italic', color='green')
-        title_color = 'green'
-        title_suffix = 'POST-BOOTSTRAP'
-    else:
-        if universe.correlation_length > XI_CRITICAL * 0.7:
-            ax_status.text(1, y_pos, '⚠️  APPROACHING CRITICAL', fontsize=14,
-                          fontweight='bold', color='orange'); y_pos -= 1
-            ax_status.text(1, y_pos, 'Correlation length growing...\nBootstrap imminent.',
-                          fontsize=11, style='italic', color='orange')
-            title_color = 'orange'
+    def save_checkpoint(self, path, extra=None):
+        """Write the complete simulation state to path (.npz), atomically
+        
+        Covers the field, scalars, constructor options and the state of the
+        universe's Generator, so a universe restored with load_checkpoint()
+        continues bit-identically. extra is any JSON-serializable run state to
+        store alongside.
+        """
+        meta = {
+            'size': self.size,
+            'noise_mode': self.noise_mode,
+            'buffer_arena': self.buffer_arena,
+            'dtype': self.dtype.name,
+            'integrator': self.integrator,
+            'etd_step': self.etd_step,
+            'bit_generator': self.bit_generator,
+            'cooling_rate': self.cooling_rate,
+            'xi_critical': self.xi_critical,
+            'sigma_tolerance': self.sigma_tolerance,
+            'observe_every': self.observe_every,
+            'bootstrap_trigger': self.bootstrap_trigger,
+            'xi_hysteresis': self.trigger.band if self.trigger is not None else XI_HYSTERESIS,
+            'trigger': [self.trigger.armed, self.trigger.fired] if self.trigger is not None else None,
+            'temperature': float(self.temperature),
+            'correlation_length': float(self.correlation_length),
+            'time': int(self.time),
+            'bootstrapped': bool(self.bootstrapped),
+            'residual_tolerance': self.residual_tolerance,
+            'steady_steps': self.steady_steps,
+            'extra': extra,
+        }
+        # Write beside the target and rename, so a kill mid-write never leaves a torn file
+        partial = f'{path}.partial'
+        with open(partial, 'wb') as f:
+            # Bit generator states hold arrays (Philox) and 128-bit integers (PCG64)
+            rng_state = np.frombuffer(pickle.dumps(self.rng.bit_generator.state), dtype=np.uint8)
+            observations = {}
+            if self.observables is not None:
+                observations['observations'], observations['spectra'] = self.observables.arrays()
+            np.savez(f, field=self.field, rng_state=rng_state, meta=np.array(json.dumps(meta)),
+                     **observations)
+        os.replace(partial, path)
+    
+    @classmethod
+    def load_checkpoint(cls, path):
+        """Restore a universe written by save_checkpoint(); returns (universe, extra)"""
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            universe = cls(meta['size'], meta['noise_mode'], meta['buffer_arena'],
+                           np.dtype(meta['dtype']), meta['integrator'], meta['etd_step'],
+                           bit_generator=meta['bit_generator'], cooling_rate=meta['cooling_rate'],
+                           xi_critical=meta['xi_critical'],
+                           sigma_tolerance=meta.get('sigma_tolerance', 0.0),
+                           observe_every=meta.get('observe_every', 0),
+                           bootstrap_trigger=meta.get('bootstrap_trigger', 'analytic'),
+                           xi_hysteresis=meta.get('xi_hysteresis', XI_HYSTERESIS),
+                           residual_tolerance=meta.get('residual_tolerance'))
+            universe.field = data['field'].copy()
+            universe.rng.bit_generator.state = pickle.loads(data['rng_state'].tobytes())
+            if universe.observables is not None:
+                universe.observables.restore(data['observations'], data['spectra'])
+        if universe.trigger is not None:
+            universe.trigger.armed, universe.trigger.fired = meta['trigger']
+        universe.temperature = meta['temperature']
+        universe.correlation_length = meta['correlation_length']
+        universe.time = meta['time']
+        universe.bootstrapped = meta['bootstrapped']
+        universe.steady_steps = meta.get('steady_steps', 0)
+        return universe, meta['extra']
+
+class FrameRenderer:
+    """Persistent figure for save_frame
+    
+    The figure, axes, colorbar, texts and progress bars are built once; each
+    frame only updates the image data, texts, bar widths and colors. The
+    tight layout and tight bounding box are computed once per phase (the only
+    thing that changes which strings appear). The figure is then held in the
+    cropped state savefig(bbox_inches='tight') would put it in, the static
+    artists are drawn once into a cached background, and each frame blits only
+    the changing artists on the Agg canvas before writing the buffer as PNG.
+    Output is pixel-identical to building and saving a fresh figure.
+    """
+    
+    def __init__(self, size=GRID_SIZE):
+        self.size = size
+        self.fig = Figure(figsize=(14, 6))
+        FigureCanvasAgg(self.fig)
+        self.base_dpi = self.fig.dpi
+        self.layouts = {}
+        self.active_layout = None
+        self.restore_bbox = None
+        self.background = None
+        
+        # Field visualization
+        self.ax_field = self.fig.add_subplot(1, 2, 1)
+        self.field_plot = self.ax_field.imshow(np.zeros((size, size)), cmap='twilight', vmin=-2, vmax=2)
+        self.ax_field.axis('off')
+        self.fig.colorbar(self.field_plot, ax=self.ax_field, fraction=0.046, pad=0.04)
+        
+        # Status panel
+        ax_status = self.fig.add_subplot(1, 2, 2)
+        ax_status.set_xlim(0, 10)
+        ax_status.set_ylim(0, 10)
+        ax_status.axis('off')
+        
+        # Status info (same y positions as the original incremental layout)
+        y_pos = 9
+        self.frame_text = ax_status.text(1, y_pos, '', fontsize=12); y_pos -= 0.8
+        self.time_text = ax_status.text(1, y_pos, '', fontsize=12); y_pos -= 0.8
+        self.temp_text = ax_status.text(1, y_pos, '', fontsize=12); y_pos -= 0.8
+        self.xi_text = ax_status.text(1, y_pos, '', fontsize=12); y_pos -= 1.2
+        self.status_text = ax_status.text(1, y_pos, '', fontsize=14, fontweight='bold'); y_pos -= 1
+        self.phase_text = ax_status.text(1, y_pos, '', fontsize=11, style='italic')
+        
+        # Progress bars
+        y_bar = 2.5
+        ax_status.add_patch(patches.Rectangle((1, y_bar), 7, 0.3,
+                                              linewidth=1, edgecolor='black', facecolor='lightgray'))
+        self.temp_bar = patches.Rectangle((1, y_bar), 0, 0.3, linewidth=0, facecolor='orangered')
+        ax_status.add_patch(self.temp_bar)
+        ax_status.text(0.5, y_bar + 0.15, 'T:', fontsize=10, ha='right', va='center')
+        
+        y_bar = 1.5
+        ax_status.add_patch(patches.Rectangle((1, y_bar), 7, 0.3,
+                                              linewidth=1, edgecolor='black', facecolor='lightgray'))
+        self.xi_bar = patches.Rectangle((1, y_bar), 0, 0.3, linewidth=0, facecolor='dodgerblue')
+        ax_status.add_patch(self.xi_bar)
+        ax_status.text(0.5, y_bar + 0.15, 'ξ:', fontsize=10, ha='right', va='center')
+        
+        self.fig.suptitle('UNIVERSE BOOTSTRAP SIMULATION\nWatching Observation Emerge from Pure Potential',
+                          fontsize=16, fontweight='bold')
+        
+        # Artists redrawn every frame, in the order a full draw paints them
+        self.dynamic = [self.field_plot, self.temp_bar, self.xi_bar,
+                        self.frame_text, self.time_text, self.temp_text, self.xi_text]
+    
+    def update(self, universe, frame_num):
+        """Point every artist at the universe's current state; returns the phase key"""
+        self.field_plot.set_data(universe.field)
+        
+        self.frame_text.set_text(f'Frame: {frame_num}')
+        self.time_text.set_text(f'Time: {universe.time} steps')
+        self.temp_text.set_text(f'Temperature: {universe.temperature:.2f}')
+        self.xi_text.set_text(f'Correlation ξ: {universe.correlation_length:.2f}')
+        
+        # Phase status
+        if universe.bootstrapped:
+            status = '⚡ OBSERVATION ACTIVE'
+            description = 'Reality stabilized.\nStructures persist.\nObservation maintains existence.'
+            color = 'green'
+            title_suffix = 'POST-BOOTSTRAP'
+        elif universe.correlation_length > universe.xi_critical * 0.7:
+            status = '⚠️  APPROACHING CRITICAL'
+            description = 'Correlation length growing...\nBootstrap imminent.'
+            color = 'orange'
+            title_suffix = 'PRE-BOOTSTRAP'
         else:
-            ax_status.text(1, y_pos, '❄️  PRE-BOOTSTRAP', fontsize=14,
-                          fontweight='bold', color='blue'); y_pos -= 1
-            ax_status.text(1, y_pos, 'Pure potential.\nRandom fluctuations.\nNo stable structure.',
-                          fontsize=11, style='italic', color='blue')
-            title_color = 'blue'
-        title_suffix = 'PRE-BOOTSTRAP'
-    
-    ax_field.set_title(f'Quantum Field - {title_suffix}',
-                      fontsize=14, fontweight='bold', color=title_color)
-    
-    # Progress bars
-    y_bar = 2.5
-    # Temperature
-    temp_bar_bg = patches.Rectangle((1, y_bar), 7, 0.3,
-                                     linewidth=1, edgecolor='black', facecolor='lightgray')
-    temp_fraction = (T_INITIAL - universe.temperature) / (T_INITIAL - T_FINAL)
-    temp_bar = patches.Rectangle((1, y_bar), 7 * temp_fraction, 0.3,
-                                  linewidth=0, facecolor='orangered')
-    ax_status.add_patch(temp_bar_bg)
-    ax_status.add_patch(temp_bar)
-    ax_status.text(0.5, y_bar + 0.15, 'T:', fontsize=10, ha='right', va='center')
-    
-    # Correlation length
-    y_bar = 1.5
-    xi_bar_bg = patches.Rectangle((1, y_bar), 7, 0.3,
-                                   linewidth=1, edgecolor='black', facecolor='lightgray')
-    xi_fraction = min(universe.correlation_length / (XI_CRITICAL * 1.5), 1.0)
-    xi_color = 'lime' if universe.correlation_length >= XI_CRITICAL else \
-               'yellow' if universe.correlation_length > XI_CRITICAL * 0.7 else 'dodgerblue'
-    xi_bar = patches.Rectangle((1, y_bar), 7 * xi_fraction, 0.3,
-                                linewidth=0, facecolor=xi_color)
-    ax_status.add_patch(xi_bar_bg)
-    ax_status.add_patch(xi_bar)
-    ax_status.text(0.5, y_bar + 0.15, 'ξ:', fontsize=10, ha='right', va='center')
-    
-    plt.suptitle('UNIVERSE BOOTSTRAP SIMULATION\nWatching Observation Emerge from Pure Potential',
-                 fontsize=16, fontweight='bold')
-    plt.tight_layout()
-    
-    plt.savefig(filename, dpi=120, bbox_inches='tight')
-    plt.close()
-
-def run_simulation():
-    """Run simulation and save key frames"""
+            status = '❄️  PRE-BOOTSTRAP'
+            description = 'Pure potential.\nRandom fluctuations.\nNo stable structure.'
+            color = 'blue'
+            title_suffix = 'PRE-BOOTSTRAP'
+        self.status_text.set_text(status)
+        self.status_text.set_color(color)
+        self.phase_text.set_text(description)
+        self.phase_text.set_color(color)
+        self.ax_field.set_title(f'Quantum Field - {title_suffix}',
+                                fontsize=14, fontweight='bold', color=color)
+        
+        # Progress bars
+        temp_fraction = (T_INITIAL - universe.temperature) / (T_INITIAL - T_FINAL)
+        self.temp_bar.set_width(7 * temp_fraction)
+        xi_fraction = min(universe.correlation_length / (universe.xi_critical * 1.5), 1.0)
+        self.xi_bar.set_width(7 * xi_fraction)
+        self.xi_bar.set_facecolor('lime' if universe.correlation_length >= universe.xi_critical else
+                                  'yellow' if universe.correlation_length > universe.xi_critical * 0.7 else
+                                  'dodgerblue')
+        return status
+    
+    def layout(self, key):
+        """Subplot parameters and padded tight bbox for a phase, computed on first use"""
+        if key not in self.layouts:
+            self.release_layout()
+            # tight_layout depends on the starting positions: start from a fresh figure's
+            self.fig.subplots_adjust(**{name: plt.rcParams[f'figure.subplot.{name}']
+                                        for name in SUBPLOT_PARAMS})
+            self.fig.tight_layout()
+            # Tight bbox exactly as savefig(bbox_inches='tight') measures it: at the save dpi
+            with cbook._setattr_cm(self.fig, dpi=FRAME_DPI):
+                bbox = self.fig.get_tightbbox(self.fig.canvas.get_renderer())
+            params = self.fig.subplotpars
+            self.layouts[key] = (
+                {name: getattr(params, name) for name in SUBPLOT_PARAMS},
+                bbox.padded(plt.rcParams['savefig.pad_inches']),
+            )
+        return self.layouts[key]
+    
+    def release_layout(self):
+        """Undo the savefig-style crop so the figure can be laid out again"""
+        if self.active_layout is not None:
+            self.restore_bbox()
+            self.fig.set_dpi(self.base_dpi)
+            self.active_layout = None
+    
+    def apply_layout(self, layout):
+        """Put the figure in the cropped, save-dpi state savefig would use and cache the static background"""
+        if layout == self.active_layout:
+            return
+        self.release_layout()
+        subplot_params, bbox = layout
+        self.fig.subplots_adjust(**subplot_params)
+        self.fig.set_dpi(FRAME_DPI)
+        renderer = self.fig.canvas.get_renderer()
+        for ax in self.fig.axes:
+            ax.apply_aspect()
+        self.restore_bbox = adjust_bbox(self.fig, bbox, renderer)
+        self.active_layout = layout
+        
+        # Everything except the per-frame artists is drawn once as the
+        # background (the phase texts and title only change with the layout key)
+        for artist in self.dynamic:
+            artist.set_visible(False)
+        self.fig.canvas.draw()
+        self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        for artist in self.dynamic:
+            artist.set_visible(True)
+    
+    def render(self, universe, filename, frame_num):
+        """Draw the universe's current state and write it to filename"""
+        self.apply_layout(self.layout(self.update(universe, frame_num)))
+        canvas = self.fig.canvas
+        canvas.restore_region(self.background)
+        for artist in self.dynamic:
+            artist.axes.draw_artist(artist)
+        mpimg.imsave(filename, np.asarray(canvas.buffer_rgba()), dpi=FRAME_DPI)
+
+def save_frame(universe, filename, frame_num, renderer=None):
+    """Save a single frame (pass a FrameRenderer to reuse its figure across frames)"""
+    if renderer is None:
+        renderer = FrameRenderer(universe.size)
+    renderer.render(universe, filename, frame_num)
+
+def phase_of(universe):
+    """Phase label of the universe's current state, as in the frame log"""
+    if universe.bootstrapped:
+        return 'POST-BOOTSTRAP'
+    if universe.correlation_length > universe.xi_critical * 0.7:
+        return 'APPROACHING'
+    return 'PRE-BOOTSTRAP'
+
+class FrameSnapshot:
+    """Copy of the state save_frame draws, detached from the running universe"""
+    
+    def __init__(self, universe):
+        self.size = universe.size
+        self.field = universe.field.copy()
+        self.time = universe.time
+        self.temperature = universe.temperature
+        self.correlation_length = universe.correlation_length
+        self.bootstrapped = universe.bootstrapped
+        self.xi_critical = universe.xi_critical
+
+_worker_renderer = None
+
+def _ignore_sigterm():
+    """Render workers finish their frames; the simulation process handles SIGTERM"""
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+def _render_snapshot(snapshot, filename, frame_num):
+    """Render one snapshot in a worker process, reusing that process's figure"""
+    global _worker_renderer
+    if _worker_renderer is None or _worker_renderer.size != snapshot.size:
+        _worker_renderer = FrameRenderer(snapshot.size)
+    _worker_renderer.render(snapshot, filename, frame_num)
+    return filename
+
+class FramePipeline:
+    """Render frames in a process pool while the simulation keeps stepping
+    
+    submit() snapshots the universe and hands it to the pool. At most
+    `backlog` frames are queued or rendering; beyond that submit() waits for
+    the oldest one, so a slow renderer throttles the simulation instead of
+    piling up snapshots. Frames complete in submission order, and each is a
+    pure function of its snapshot, so output is identical to rendering inline.
+    With workers=0 frames are rendered inline with one FrameRenderer.
+    """
+    
+    def __init__(self, workers=RENDER_WORKERS, backlog=RENDER_BACKLOG):
+        self.backlog = max(1, backlog)
+        self.pending = deque()
+        self.pool = ProcessPoolExecutor(workers, initializer=_ignore_sigterm) if workers else None
+        self.renderer = None
+    
+    def submit(self, universe, filename, frame_num):
+        """Queue a frame of the universe's current state"""
+        if self.pool is None:
+            if self.renderer is None:
+                self.renderer = FrameRenderer(universe.size)
+            self.renderer.render(universe, filename, frame_num)
+            return
+        while len(self.pending) >= self.backlog:
+            self.pending.popleft().result()
+        self.pending.append(self.pool.submit(_render_snapshot, FrameSnapshot(universe),
+                                             filename, frame_num))
+    
+    def flush(self):
+        """Wait for every queued frame, re-raising the first render error"""
+        while self.pending:
+            self.pending.popleft().result()
+    
+    def close(self):
+        """Flush and stop the pool"""
+        try:
+            self.flush()
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown(cancel_futures=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+def stop_reason(universe, step, bootstrap_frame, elapsed):
+    """Why the run should end before its last step, once `step` steps are done (or None)
+    
+    The conditions are STOP_AFTER_BOOTSTRAP, the universe's residual tolerance
+    held for STEADY_WINDOW steps, and WALL_CLOCK_BUDGET against `elapsed`
+    seconds.
+    """
+    if (STOP_AFTER_BOOTSTRAP is not None and bootstrap_frame is not None
+            and step > bootstrap_frame + STOP_AFTER_BOOTSTRAP):
+        return f"{STOP_AFTER_BOOTSTRAP} steps after bootstrap"
+    if universe.residual_tolerance is not None and universe.steady_steps >= STEADY_WINDOW:
+        return (f"steady state, ||Δφ||/||φ|| < {universe.residual_tolerance:g} "
+                f"for {universe.steady_steps} steps")
+    if WALL_CLOCK_BUDGET is not None and elapsed >= WALL_CLOCK_BUDGET:
+        return f"wall-clock budget of {WALL_CLOCK_BUDGET:g} s used"
+    return None
+
+def run_simulation(checkpoint=CHECKPOINT_PATH, trajectory=TRAJECTORY_PATH, observables=OBSERVABLES_PATH,
+                   domains=DOMAINS_PATH):
+    """Run simulation and save key frames
+    
+    Every TRAJECTORY_EVERY steps the field and its state are also appended to
+    the trajectory store at `trajectory` (see bootstrap_trajectory.py). The
+    observation series (see bootstrap_observables.py) is written to
+    `observables` at the end. Every DOMAIN_EVERY steps the field's sign domains
+    are tracked (see bootstrap_domains.py), and written to `domains` at each
+    checkpoint and at the end.
+    
+    Frames are captured every CAPTURE_SPARSE_EVERY steps, and densely around
+    events such as the bootstrap (see bootstrap_capture.py).
+    
+    If the checkpoint file exists the run resumes from it, bit-identically.
+    A checkpoint is written every CHECKPOINT_EVERY steps and on SIGTERM (after
+    which the run exits), and removed once the run completes.
+    
+    The run ends early once a stop condition holds (see stop_reason()). The
+    conditions are checked after each block of steps.
+    """
+    started = time.perf_counter()
     print("="*70)
     print("UNIVERSE BOOTSTRAP SIMULATION")
     print("Based on Solvency Field Theory - Bootstrap Mechanism")
     print("="*70)
     print()
     
-    universe = UniverseBootstrap()
+    resumed = checkpoint is not None and os.path.exists(checkpoint)
+    if resumed:
+        universe, run_state = UniverseBootstrap.load_checkpoint(checkpoint)
+    else:
+        universe = UniverseBootstrap(seed=SEED)
+    pipeline = FramePipeline()
+    writer = None
+    if trajectory is not None:
+        from bootstrap_trajectory import TrajectoryWriter
+        writer = TrajectoryWriter(trajectory, universe.size, universe.dtype,
+                                  resume_count=run_state['trajectory_count'] if resumed else None)
+    tracker = None
+    if domains is not None:
+        from bootstrap_domains import DomainTracker
+        if resumed and os.path.exists(domains):
+            tracker = DomainTracker.load(domains)
+        else:
+            tracker = DomainTracker(universe.size)
     
-    # Frames to capture
-    frames_to_save = [0, 200, 400, 600, 800, 1000, 1200, 1400, 1600, 1800, 2000, 2200, 2400, 2600, 2800]
+    # Frames to capture: sparse, plus dense windows around events
+    capture = CaptureScheduler(universe.size, universe.dtype, CAPTURE_EVERY, CAPTURE_RING,
+                               CAPTURE_AFTER, CAPTURE_SPARSE_EVERY, CAPTURE_QUANTIZE)
+    capture_state = f'{checkpoint}.capture.npz' if checkpoint is not None else None
+    if resumed and os.path.exists(capture_state):
+        capture.restore(capture_state)
     saved_frames = []
     frame_count = 0
     bootstrap_frame = None
     
+    # SIGTERM (preemption) only sets a flag; the loop checkpoints at its next stop
+    terminate = []
+    if checkpoint is not None:
+        previous_sigterm = signal.signal(signal.SIGTERM, lambda signum, frame: terminate.append(signum))
+    
     print("Running simulation...")
-    print(f"Initial: T={universe.temperature:.1f}, ξ={universe.correlation_length:.2f}")
+    if resumed:
+        print(f"Resumed at step {run_state['step']} from {checkpoint}: "
+              f"T={universe.temperature:.1f}, ξ={universe.correlation_length:.2f}")
+    else:
+        print(f"Initial: T={universe.temperature:.1f}, ξ={universe.correlation_length:.2f}")
     print()
     
-    for step in range(3000):  # Run longer!
-        bootstrapped = universe.step()
+    first_step = 0
+    if resumed:
+        saved_frames = [tuple(frame) for frame in run_state['saved_frames']]
+        frame_count = run_state['frame_count']
+        bootstrap_frame = run_state['bootstrap_frame']
+    elif FAST_FORWARD:
+        first_step = universe.fast_forward_to_bootstrap()
+        print(f"Fast-forwarded {first_step} pre-bootstrap steps")
+        print()
+    
+    total_steps = 3000  # Run longer!
+    step = run_state['step'] if resumed else first_step
+    if universe.sigma_tolerance:
+        effect = universe.noise_quantization_effect(total_steps - step)
+        print(f"Noise batching: σ quantized within ±{effect['sigma']:.2%}, noise variance within "
+              f"±{effect['variance']:.2%} per step ({effect['variance_bias']:+.3%} on average)")
+        print()
+    while step < total_steps:
+        if FAST_FORWARD and not resumed and step == first_step:
+            bootstrapped = True  # fast_forward_to_bootstrap() already took this step
+        else:
+            # Stride straight to the next captured frame, snapshot or checkpoint;
+            # advance() stops early on bootstrap
+            stops = capture.stops(step) + [total_steps - 1]
+            if writer is not None:
+                stops.append(step + -step % TRAJECTORY_EVERY)
+            if tracker is not None:
+                stops.append(step + -step % DOMAIN_EVERY)
+            if checkpoint is not None:
+                stops.append(step + CHECKPOINT_EVERY - 1 - step % CHECKPOINT_EVERY)
+            if STOP_AFTER_BOOTSTRAP is not None and bootstrap_frame is not None:
+                stops.append(max(step, bootstrap_frame + STOP_AFTER_BOOTSTRAP))
+            stop = min(stops)
+            events = universe.advance(stop - step + 1)
+            step += events['steps'] - 1
+            bootstrapped = events['bootstrap'] is not None
         
         if bootstrapped:
             bootstrap_frame = step
@@ -189,23 +968,77 @@ def run_simulation():
             print()
             # Save bootstrap moment
             filename = f'/home/claude/frame_bootstrap.png'
-            save_frame(universe, filename, step)
+            pipeline.submit(universe, filename, step)
             saved_frames.append(('BOOTSTRAP', filename))
         
-        if step in frames_to_save:
-            filename = f'/home/claude/frame_{step:04d}.png'
-            save_frame(universe, filename, step)
-            saved_frames.append((step, filename))
+        for frame_step, label, frame in capture.update(universe, step, bootstrapped):
+            filename = f'/home/claude/frame_{frame_step:04d}.png'
+            pipeline.submit(frame, filename, frame_step)
+            saved_frames.append((label, filename))
             frame_count += 1
-            
+        
+        if step % CAPTURE_SPARSE_EVERY == 0:
             status = "POST-BOOTSTRAP ⚡" if universe.bootstrapped else \
-                    "APPROACHING" if universe.correlation_length > XI_CRITICAL * 0.7 else \
+                    "APPROACHING" if universe.correlation_length > universe.xi_critical * 0.7 else \
                     "PRE-BOOTSTRAP"
+            measured = ""
+            if universe.observables is not None:
+                measured = f" (measured {universe.observables.latest()['xi_measured']:6.2f})"
             print(f"Frame {step:4d}: T={universe.temperature:6.2f}, " +
-                  f"ξ={universe.correlation_length:6.2f} [{status}]")
+                  f"ξ={universe.correlation_length:6.2f}{measured} [{status}]")
+        
+        if writer is not None and step % TRAJECTORY_EVERY == 0:
+            writer.append(universe, step)
+        if tracker is not None and step % DOMAIN_EVERY == 0:
+            tracker.update(universe.field, step)
+        
+        step += 1
+        
+        if checkpoint is not None and (step % CHECKPOINT_EVERY == 0 or terminate):
+            # Frames and snapshots listed in the checkpoint are on disk
+            pipeline.flush()
+            if writer is not None:
+                writer.flush()
+            if tracker is not None:
+                tracker.save(domains)
+            capture.save(capture_state)
+            universe.save_checkpoint(checkpoint, extra={
+                'step': step,
+                'saved_frames': saved_frames,
+                'frame_count': frame_count,
+                'bootstrap_frame': bootstrap_frame,
+                'trajectory_count': writer.count if writer is not None else 0,
+            })
+            if terminate:
+                pipeline.close()
+                if writer is not None:
+                    writer.close()
+                print(f"SIGTERM: checkpointed at step {step} to {checkpoint}")
+                raise SystemExit(128 + signal.SIGTERM)
+        
+        reason = stop_reason(universe, step, bootstrap_frame, time.perf_counter() - started)
+        if reason is not None:
+            print(f"Stopping early after {step} of {total_steps} steps: {reason}")
+            break
     
+    pipeline.close()  # Remaining frames finish rendering
+    if writer is not None:
+        writer.close()
+    if observables is not None and universe.observables is not None:
+        universe.observables.save(observables)
+    if tracker is not None:
+        tracker.save(domains)
+    if checkpoint is not None:
+        signal.signal(signal.SIGTERM, previous_sigterm)
+        for path in (checkpoint, capture_state):
+            if os.path.exists(path):
+                os.remove(path)
     print()
     print(f"Final: T={universe.temperature:.2f}, ξ={universe.correlation_length:.2f}")
+    if tracker is not None:
+        final, lifetimes = tracker.series()[-1], tracker.lifetimes()
+        print(f"Domains: {final['count']} at the end (largest {final['largest']} cells); "
+              f"{len(lifetimes)} died, median lifetime {np.median(lifetimes) if len(lifetimes) else 0:.0f} steps")
     print()
     print("="*70)
     print(f"Simulation complete! Saved {len(saved_frames)} frames")
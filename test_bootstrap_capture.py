@@ -0,0 +1,46 @@
+"""Event windows of the capture scheduler (python -m pytest test_bootstrap_capture.py)"""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from bootstrap_capture import CAPTURE_AFTER, CaptureScheduler
+from run_bootstrap_sim import UniverseBootstrap
+
+
+def run_capture(size, seed, steps=3000):
+    """Drive a scheduler through a seeded run the way run_simulation does"""
+    universe = UniverseBootstrap(size, seed=seed)
+    capture = CaptureScheduler(universe.size, universe.dtype)
+    frames, bootstrap_step, step = [], None, 0
+    while step < steps:
+        stop = min(capture.stops(step) + [steps - 1])
+        events = universe.advance(stop - step + 1)
+        step += events['steps'] - 1
+        if events['bootstrap'] is not None:
+            bootstrap_step = step
+        frames += [frame_step for frame_step, _, _ in
+                   capture.update(universe, step, events['bootstrap'] is not None)]
+        step += 1
+    return capture, frames, bootstrap_step
+
+
+def test_post_bootstrap_noise_opens_no_windows():
+    capture, frames, bootstrap_step = run_capture(128, seed=0)
+    assert bootstrap_step is not None
+    assert capture.windows <= 2
+    assert all(kind == 'bootstrap' or step - bootstrap_step <= CAPTURE_AFTER
+               for kind, step in capture.events)
+    assert len(frames) <= 50
+    assert bootstrap_step not in frames  # run_simulation saves it as frame_bootstrap.png
+
+
+def test_repeated_events_do_not_stretch_the_window():
+    universe = SimpleNamespace(field=np.zeros((8, 8)), observables=None, time=0, temperature=1.0,
+                               correlation_length=1.0, bootstrapped=True, xi_critical=8.0)
+    capture = CaptureScheduler(8, ring=0, sparse_every=10**6)
+    for step in range(100, 101 + CAPTURE_AFTER, 5):
+        capture.update(universe, step, bootstrapped=True)
+    assert capture.windows == 1
+    assert capture.events == [('bootstrap', 100)]
+    assert capture.window_end == 100 + CAPTURE_AFTER
@@ -11,6 +11,9 @@ Shows:
 Based on Solvency Field Theory framework
 """
 
+import threading
+import time
+
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
@@ -26,15 +29,45 @@ COOLING_RATE = 0.5 # How fast temperature drops
 XI_CRITICAL = 10.0  # Critical correlation length (in grid units)
 
 # Simulation parameters
-STEPS_PER_FRAME = 5
+STEPS_PER_FRAME = 5  # Steps per displayed frame at the start; adapted to TARGET_FPS from there
+TARGET_FPS = 20  # Frame rate the background simulation paces its snapshots to
+MAX_STEPS_PER_FRAME = 100  # Cap on the adapted steps per frame (keeps small grids watchable)
+DISPLAY_MAX_SIZE = 512  # Larger fields are block-averaged down to at most this size for display
 NOISE_AMPLITUDE = 1.0
+NOISE_MODE = 'filter'  # 'filter' (gaussian_filter), 'spectral' (FFT), 'recursive' (IIR) or 'multires' (coarse-grid FFT)
+DTYPE = np.float64     # Field/noise precision: np.float64 or np.float32
+SEED = None            # Seed of the run's random stream (None: fresh entropy)
+BIT_GENERATOR = 'pcg64'  # 'pcg64' or 'philox' (counter-based)
 
 class UniverseBootstrap:
     """Simulate universe bootstrap from pure potential"""
     
-    def __init__(self, size=GRID_SIZE):
+    def __init__(self, size=GRID_SIZE, noise_mode=NOISE_MODE, dtype=DTYPE, seed=SEED,
+                 bit_generator=BIT_GENERATOR):
+        if noise_mode not in ('filter', 'spectral', 'recursive', 'multires'):
+            raise ValueError(f"Unknown noise mode: {noise_mode!r}")
+        if np.dtype(dtype) not in (np.float32, np.float64):
+            raise ValueError(f"Unsupported dtype: {dtype!r}")
         self.size = size
-        self.field = np.random.randn(size, size) * 0.1  # Initial quantum fluctuations
+        self.noise_mode = noise_mode
+        self.dtype = np.dtype(dtype)
+        # Every draw comes from this universe's own Generator, in the working dtype
+        from bootstrap_noise import make_rng
+        self.rng = make_rng(seed, bit_generator)
+        self.spectral_noise = None
+        if noise_mode == 'spectral':
+            from bootstrap_noise import SpectralNoise
+            self.spectral_noise = SpectralNoise(size, dtype, self.rng)
+        elif noise_mode == 'multires':
+            from bootstrap_noise import MultiresNoise
+            self.spectral_noise = MultiresNoise(size, dtype, self.rng)
+        self.recursive_filter = None
+        if noise_mode == 'recursive':
+            from bootstrap_recursive import RecursiveGaussian
+            self.recursive_filter = RecursiveGaussian(size, dtype)
+        # Initial quantum fluctuations
+        self.field = self.rng.standard_normal((size, size), dtype=self.dtype)
+        self.field *= 0.1
         self.temperature = T_INITIAL
         self.time = 0
         self.bootstrapped = False
@@ -50,14 +83,23 @@ class UniverseBootstrap:
     
     def generate_correlated_noise(self, xi):
         """Generate noise with correlation length xi"""
-        # Start with white noise
-        noise = np.random.randn(self.size, self.size)
-        
-        # Apply Gaussian filter to create correlations
-        # Correlation length controlled by filter width
-        from scipy.ndimage import gaussian_filter
         sigma = xi / 3.0  # Convert correlation length to Gaussian sigma
-        correlated = gaussian_filter(noise, sigma=sigma, mode='wrap')
+        
+        if self.spectral_noise is not None:
+            # Sample filtered noise directly in Fourier space (one inverse rFFT)
+            correlated = self.spectral_noise.sample(sigma)
+        else:
+            # Start with white noise
+            noise = self.rng.standard_normal((self.size, self.size), dtype=self.dtype)
+            
+            # Apply Gaussian filter to create correlations
+            # Correlation length controlled by filter width
+            if self.recursive_filter is not None:
+                # Recursive approximation: same cost for every sigma
+                correlated = self.recursive_filter.filter(noise, sigma)
+            else:
+                from scipy.ndimage import gaussian_filter
+                correlated = gaussian_filter(noise, sigma=sigma, output=self.dtype, mode='wrap')
         
         return correlated * NOISE_AMPLITUDE
     
@@ -113,6 +155,78 @@ class UniverseBootstrap:
         self.xi_history.append(self.correlation_length)
         self.time += 1
     
+    def temperature_schedule(self, steps):
+        """Temperatures after each of the next `steps` calls to step()
+        
+        Same float operations as step()'s repeated subtraction, so the values
+        (and hence the bootstrap step) are bit-identical.
+        """
+        if self.temperature <= T_FINAL:
+            return np.full(steps, self.temperature)
+        decrements = np.full(steps + 1, -(COOLING_RATE * 0.01))
+        decrements[0] = self.temperature
+        temperatures = np.cumsum(decrements)[1:]
+        # Cooling stops on the first step that reaches T_FINAL
+        floor = np.flatnonzero(temperatures <= T_FINAL)
+        if len(floor):
+            temperatures[floor[0]:] = temperatures[floor[0]]
+        return temperatures
+    
+    def advance(self, steps, stop_on_bootstrap=True):
+        """Run up to `steps` steps as one block
+        
+        The temperature/xi schedule for the block is computed up front and the
+        field updates run in a tight loop; histories are extended once per block.
+        Returns a record of the block:
+            'steps':     number of steps taken (fewer than requested only when
+                         stopping on bootstrap)
+            'bootstrap': offset in the block of the bootstrap step, or None
+            'cooled':    offset of the step where T reached T_FINAL, or None
+        As in step(), the bootstrap step itself already uses the post-bootstrap update.
+        """
+        if steps <= 0:
+            return {'steps': 0, 'bootstrap': None, 'cooled': None}
+        
+        cooling = self.temperature > T_FINAL
+        temperatures = self.temperature_schedule(steps)
+        xis = self.calculate_xi(temperatures)
+        
+        bootstrap = None
+        if not self.bootstrapped:
+            crossed = np.flatnonzero(xis >= XI_CRITICAL)
+            if len(crossed):
+                bootstrap = int(crossed[0])
+        
+        taken = bootstrap + 1 if stop_on_bootstrap and bootstrap is not None else steps
+        cooled = None
+        if cooling:
+            floor = np.flatnonzero(temperatures[:taken] <= T_FINAL)
+            if len(floor):
+                cooled = int(floor[0])
+        
+        if self.bootstrapped:
+            pre = 0
+        else:
+            pre = taken if bootstrap is None else bootstrap
+        
+        xis = xis[:taken].tolist()
+        for xi in xis[:pre]:
+            self.correlation_length = xi
+            self.update_field_pre_bootstrap()
+        if bootstrap is not None:
+            self.bootstrapped = True
+            print(f"🔥 BOOTSTRAP! at T={temperatures[bootstrap]:.2f}, ξ={xis[bootstrap]:.2f}")
+        for xi in xis[pre:]:
+            self.correlation_length = xi
+            self.update_field_post_bootstrap()
+        
+        temperatures = temperatures[:taken].tolist()
+        self.temperature = temperatures[-1]
+        self.temp_history.extend(temperatures)
+        self.xi_history.extend(xis)
+        self.time += taken
+        return {'steps': taken, 'bootstrap': bootstrap, 'cooled': cooled}
+    
     def get_state(self):
         """Return current state for visualization"""
         return {
@@ -123,16 +237,108 @@ class UniverseBootstrap:
             'time': self.time
         }
 
+def display_factor(size, max_size=DISPLAY_MAX_SIZE):
+    """Block size that brings a size x size field down to at most max_size per side"""
+    return -(-size // max_size)
+
+def downsample(field, factor, out):
+    """Block-average field by factor into out (trailing rows/columns that do not fill a block are dropped)"""
+    if factor == 1:
+        out[...] = field
+        return out
+    n = out.shape[0]
+    blocks = field[:n * factor, :n * factor].reshape(n, factor, n, factor)
+    return np.mean(blocks, axis=(1, 3), out=out)
+
+class SimulationThread:
+    """Steps a universe on a background thread, publishing double-buffered display snapshots
+    
+    Each round runs universe.advance() for steps_per_frame steps, downsamples
+    the field into the back buffer and swaps it to the front. steps_per_frame
+    adapts so that a round takes one frame interval (1 / target_fps). Rounds
+    that finish early sleep out the interval, so the simulation never runs
+    ahead of the display. latest() hands the GUI a copy of the front snapshot.
+    Only the thread touches the universe while it runs.
+    """
+    
+    def __init__(self, universe, target_fps=TARGET_FPS, steps_per_frame=STEPS_PER_FRAME,
+                 max_steps=MAX_STEPS_PER_FRAME, display_size=DISPLAY_MAX_SIZE):
+        self.universe = universe
+        self.interval = 1.0 / target_fps
+        self.steps_per_frame = steps_per_frame
+        self.max_steps = max_steps
+        self.factor = display_factor(universe.size, display_size)
+        shape = (universe.size // self.factor,) * 2
+        self.buffers = [np.empty(shape, dtype=np.float32) for _ in range(2)]
+        self.states = [None, None]
+        self.front = 0
+        self.sequence = 0
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.error = None
+        self.publish()
+        self.thread = threading.Thread(target=self.run, name='simulation', daemon=True)
+    
+    def publish(self):
+        """Snapshot the universe into the back buffer and make it the front"""
+        back = 1 - self.front
+        downsample(self.universe.field, self.factor, self.buffers[back])
+        self.states[back] = {
+            'temperature': self.universe.temperature,
+            'xi': self.universe.correlation_length,
+            'bootstrapped': self.universe.bootstrapped,
+            'time': self.universe.time,
+            'steps_per_frame': self.steps_per_frame,
+        }
+        with self.lock:
+            self.front = back
+            self.sequence += 1
+    
+    def latest(self):
+        """(sequence number, state with a copy of the display field) of the newest snapshot"""
+        if self.error is not None:
+            raise self.error
+        with self.lock:
+            state = dict(self.states[self.front], field=self.buffers[self.front].copy())
+            return self.sequence, state
+    
+    def run(self):
+        try:
+            while not self.stop_event.is_set():
+                start = time.perf_counter()
+                self.universe.advance(self.steps_per_frame, stop_on_bootstrap=False)
+                elapsed = time.perf_counter() - start
+                self.publish()
+                # Aim the next round at one frame interval, changing by at most 2x per round
+                ratio = min(max(self.interval / max(elapsed, 1e-6), 0.5), 2.0)
+                self.steps_per_frame = int(min(max(round(self.steps_per_frame * ratio), 1), self.max_steps))
+                self.stop_event.wait(self.interval - elapsed)
+        except Exception as error:
+            self.error = error
+    
+    def start(self):
+        self.thread.start()
+    
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
 def create_animation():
-    """Create animated visualization of bootstrap"""
+    """Create animated visualization of bootstrap
+    
+    The simulation runs on a SimulationThread; the animation draws the
+    newest snapshot on each tick and skips ticks with nothing new.
+    """
     universe = UniverseBootstrap()
+    simulation = SimulationThread(universe)
+    _, first = simulation.latest()
     
     # Set up the figure
     fig = plt.figure(figsize=(14, 6))
     
     # Main field visualization
     ax_field = plt.subplot(1, 2, 1)
-    field_plot = ax_field.imshow(universe.field, cmap='twilight', 
+    field_plot = ax_field.imshow(first['field'], cmap='twilight',
                                    animated=True, vmin=-2, vmax=2)
     ax_field.set_title('Quantum Field', fontsize=14, fontweight='bold')
     ax_field.axis('off')
@@ -172,19 +378,22 @@ def create_animation():
     ax_status.text(0.5, 2.65, 'T:', fontsize=10, ha='right')
     ax_status.text(0.5, 1.65, 'ξ:', fontsize=10, ha='right')
     
+    artists = [field_plot, time_text, temp_text, xi_text, status_text,
+               phase_text, temp_bar, xi_bar]
+    shown = {'sequence': None, 'phase': None}
+    
     def update(frame):
-        """Update function for animation"""
-        # Run multiple steps per frame for speed
-        for _ in range(STEPS_PER_FRAME):
-            universe.step()
-        
-        state = universe.get_state()
+        """Update function for animation: draw the newest snapshot, if there is one"""
+        sequence, state = simulation.latest()
+        if sequence == shown['sequence']:
+            return artists
+        shown['sequence'] = sequence
         
         # Update field visualization
         field_plot.set_array(state['field'])
         
         # Update status text
-        time_text.set_text(f"Time: {state['time']} steps")
+        time_text.set_text(f"Time: {state['time']} steps ({state['steps_per_frame']}/frame)")
         temp_text.set_text(f"Temperature: {state['temperature']:.2f}")
         xi_text.set_text(f"Correlation ξ: {state['xi']:.2f}")
         
@@ -221,11 +430,20 @@ def create_animation():
         else:
             xi_bar.set_facecolor('dodgerblue')
         
-        return [field_plot, time_text, temp_text, xi_text, status_text, 
-                phase_text, temp_bar, xi_bar]
+        # The title is outside the blitted axes area: redraw the whole figure
+        # when it changes (which also refreshes the blit background)
+        phase = ax_field.get_title()
+        if phase != shown['phase']:
+            shown['phase'] = phase
+            fig.canvas.draw_idle()
+        
+        return artists
     
-    # Create animation
-    anim = FuncAnimation(fig, update, frames=500, interval=50, blit=True)
+    # Create animation; the simulation thread stops with the window
+    anim = FuncAnimation(fig, update, frames=None, interval=1000 / TARGET_FPS, blit=True,
+                         cache_frame_data=False)
+    fig.canvas.mpl_connect('close_event', lambda event: simulation.stop())
+    simulation.start()
     
     plt.suptitle('UNIVERSE BOOTSTRAP SIMULATION\nWatching Observation Emerge from Pure Potential',
                  fontsize=16, fontweight='bold')